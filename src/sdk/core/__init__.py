@@ -1,3 +1,33 @@
-from .slides import Slide, SlideCollection, SlideStyleProps
-from .workspace import Workspace, AssetMetadata
-from .state import SessionState, StylePreset
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .slides import Slide, SlideCollection, SlideStyleProps
+    from .workspace import Workspace, AssetMetadata
+    from .state import SessionState, StylePreset
+
+# Resolved lazily (PEP 562) so importing one submodule doesn't load them all.
+_EXPORTS: dict[str, str] = {
+    "Slide": ".slides",
+    "SlideCollection": ".slides",
+    "SlideStyleProps": ".slides",
+    "Workspace": ".workspace",
+    "AssetMetadata": ".workspace",
+    "SessionState": ".state",
+    "StylePreset": ".state",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,10 +1,34 @@
-"""Slides package — public API re-exports."""
+"""Slides package — public API re-exports.
 
-from .styles import SlideStyleProps, TextShadow, TextOutline, TextBox, TextPosition
-from .animations import Keyframe, TextAnimation, SlideTransition, SlideEffect
-from .slide import Slide
-from .collection import SlideCollection
-from .templates import FrameTemplate, TemplateLibrary
+Names are resolved lazily (PEP 562): a submodule is only imported, and its
+Pydantic validators built, when one of its names is first accessed.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .styles import SlideStyleProps, TextShadow, TextOutline, TextBox, TextPosition
+    from .animations import Keyframe, TextAnimation, SlideTransition, SlideEffect
+    from .slide import Slide
+    from .collection import SlideCollection
+    from .templates import FrameTemplate, TemplateLibrary
+
+_EXPORTS: dict[str, str] = {
+    "Slide": ".slide",
+    "SlideCollection": ".collection",
+    "SlideStyleProps": ".styles",
+    "TextShadow": ".styles",
+    "TextOutline": ".styles",
+    "TextBox": ".styles",
+    "TextPosition": ".styles",
+    "Keyframe": ".animations",
+    "TextAnimation": ".animations",
+    "SlideTransition": ".animations",
+    "SlideEffect": ".animations",
+    "FrameTemplate": ".templates",
+    "TemplateLibrary": ".templates",
+}
 
 __all__ = [
     "Slide",
@@ -21,3 +45,16 @@ __all__ = [
     "FrameTemplate",
     "TemplateLibrary",
 ]
+
+
+def __getattr__(name: str):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value  # cache so __getattr__ isn't hit again
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -90,11 +90,13 @@ class SlideCollection(BaseModel):
         return s1
 
     def reorder(self, slide_id_list: list[str]) -> bool:
-        id_set = {s.id for s in self.slides}
-        if set(slide_id_list) != id_set:
+        if len(slide_id_list) != len(self.slides):
             return False
 
         id_to_slide = {s.id: s for s in self.slides}
+        if set(slide_id_list) != id_to_slide.keys():
+            return False
+
         self.slides = [id_to_slide[sid] for sid in slide_id_list]
         self._reindex()
         return True
@@ -1,10 +1,13 @@
 """Session state management with undo support and style presets."""
 
 import json
+from collections import deque
 from typing import Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr, field_validator
+from pydantic_core import to_json
 
-from .slides import SlideCollection, SlideStyleProps
+from ..fileio import atomic_write_bytes
+from .slides import Slide, SlideCollection, SlideStyleProps
 from .slides.templates import TemplateLibrary
 from .workspace import Workspace
 
@@ -59,41 +62,79 @@ BUILTIN_PRESETS: dict[str, StylePreset] = {
     ),
 }
 
+# Preset summaries never change, so build them once for list_presets()
+_PRESET_SUMMARIES: tuple[dict, ...] = tuple(
+    {"name": p.name, "description": p.description}
+    for p in BUILTIN_PRESETS.values()
+)
+
+
+# Oldest undo entries are evicted by the deque once this many are stored
+UNDO_LIMIT = 50
+
 
 class UndoEntry(BaseModel):
-    """A snapshot of slides state for undo."""
+    """A snapshot of slides state for undo.
+
+    Slides are stored as one UTF-8 JSON blob each, and every other
+    SlideCollection field goes into collection_json. Blobs that did not
+    change since the previous entry are shared with it, so each entry only
+    costs new memory for the parts that were actually edited.
+    """
     description: str
-    slides_json: str  # JSON-serialized SlideCollection
+    collection_json: bytes
+    slide_jsons: tuple[bytes, ...] = ()
 
 
 class SessionState(BaseModel):
     """Global session state for a video draft session."""
     workspace: Optional[Workspace] = None
     slides: SlideCollection = Field(default_factory=SlideCollection)
-    undo_stack: list[UndoEntry] = Field(default_factory=list)
+    undo_stack: deque[UndoEntry] = Field(
+        default_factory=lambda: deque(maxlen=UNDO_LIMIT)
+    )
     templates: TemplateLibrary = Field(default_factory=TemplateLibrary)
     whisper_model_size: str = "base"
     transcript_cache: Optional[str] = None
+    # (path, payload hash) of the last slides.json write, to skip no-op saves
+    _last_save: Optional[tuple[str, int]] = PrivateAttr(default=None)
 
     model_config = {"arbitrary_types_allowed": True}
 
+    @field_validator("undo_stack")
+    @classmethod
+    def _bound_undo_stack(cls, v: deque[UndoEntry]) -> deque[UndoEntry]:
+        # Validated input (a list, or a deque from elsewhere) comes back
+        # without our maxlen; re-wrap it so the stack stays bounded.
+        if v.maxlen == UNDO_LIMIT:
+            return v
+        return deque(v, maxlen=UNDO_LIMIT)
+
     def checkpoint(self, description: str):
         """Save current slides state to undo stack."""
-        entry = UndoEntry(
+        collection_json = to_json(self.slides, exclude={"slides"})
+        slide_jsons = tuple(to_json(s) for s in self.slides.slides)
+        if self.undo_stack:
+            prev = self.undo_stack[-1]
+            shared = {j: j for j in prev.slide_jsons}
+            slide_jsons = tuple(shared.get(j, j) for j in slide_jsons)
+            if collection_json == prev.collection_json:
+                collection_json = prev.collection_json
+        entry = UndoEntry.model_construct(
             description=description,
-            slides_json=self.slides.model_dump_json(),
+            collection_json=collection_json,
+            slide_jsons=slide_jsons,
         )
         self.undo_stack.append(entry)
-        # Keep max 50 undo entries
-        if len(self.undo_stack) > 50:
-            self.undo_stack = self.undo_stack[-50:]
 
     def undo(self) -> Optional[str]:
         """Revert to the last checkpoint. Returns description of what was undone."""
         if not self.undo_stack:
             return None
         entry = self.undo_stack.pop()
-        self.slides = SlideCollection.model_validate_json(entry.slides_json)
+        slides = SlideCollection.model_validate_json(entry.collection_json)
+        slides.slides = [Slide.model_validate_json(j) for j in entry.slide_jsons]
+        self.slides = slides
         return entry.description
 
     def auto_save(self):
@@ -106,7 +147,12 @@ class SessionState(BaseModel):
         if not self.workspace:
             return
         slides_path = self.workspace.root_path / "slides.json"
-        slides_path.write_text(self.slides.model_dump_json(indent=2))
+        payload = to_json(self.slides)
+        fingerprint = (str(slides_path), hash(payload))
+        if fingerprint == self._last_save and slides_path.exists():
+            return
+        atomic_write_bytes(slides_path, payload)
+        self._last_save = fingerprint
 
     def load_slides_from_workspace(self):
         """Load slides from workspace if they exist."""
@@ -115,7 +161,7 @@ class SessionState(BaseModel):
         slides_path = self.workspace.root_path / "slides.json"
         if slides_path.exists():
             self.slides = SlideCollection.model_validate_json(
-                slides_path.read_text()
+                slides_path.read_bytes()
             )
 
     @staticmethod
@@ -124,7 +170,6 @@ class SessionState(BaseModel):
 
     @staticmethod
     def list_presets() -> list[dict]:
-        return [
-            {"name": p.name, "description": p.description}
-            for p in BUILTIN_PRESETS.values()
-        ]
+        # New list per call; the summary dicts themselves are shared and
+        # must be treated as read-only.
+        return list(_PRESET_SUMMARIES)
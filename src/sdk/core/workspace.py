@@ -1,10 +1,13 @@
 """Project workspace and asset management."""
 
-import json
 import shutil
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Iterator, Optional
+from pydantic import BaseModel, Field, PrivateAttr
+from pydantic_core import to_json
+
+from ..fileio import atomic_write_bytes
 
 
 class AssetMetadata(BaseModel):
@@ -16,11 +19,24 @@ class AssetMetadata(BaseModel):
     dimensions: Optional[tuple[int, int]] = None
 
 
+class _Manifest(BaseModel):
+    """On-disk layout of project.json."""
+    project_name: str
+    assets: dict[str, AssetMetadata] = Field(default_factory=dict)
+
+
 class Workspace(BaseModel):
     """Manages a video draft project directory and asset manifest."""
     project_name: str
     root_path: Path
     assets: dict[str, AssetMetadata] = Field(default_factory=dict)
+    # Set when assets changed but the manifest has not been written yet
+    _dirty: bool = PrivateAttr(default=False)
+    _batch_depth: int = PrivateAttr(default=0)
+    # (root_path, asset type -> directory) for get_asset_path
+    _type_dirs_cache: Optional[tuple[Path, dict[str, Path]]] = PrivateAttr(
+        default=None
+    )
 
     model_config = {"arbitrary_types_allowed": True}
 
@@ -52,11 +68,30 @@ class Workspace(BaseModel):
     def manifest_path(self) -> Path:
         return self.root_path / "project.json"
 
+    @property
+    def _type_dirs(self) -> dict[str, Path]:
+        # Keyed on the root_path object, so assigning root_path or
+        # model_copy(update=...) rebuilds the map instead of serving stale
+        # directories.
+        cached = self._type_dirs_cache
+        if cached is None or cached[0] is not self.root_path:
+            cached = (self.root_path, {
+                "image": self.images_dir,
+                "audio": self.audio_dir,
+                "video": self.video_dir,
+                "blender": self.blender_dir,
+            })
+            self._type_dirs_cache = cached
+        return cached[1]
+
     def initialize(self) -> "Workspace":
         """Create the project directory structure."""
-        for d in [self.images_dir, self.audio_dir, self.video_dir,
-                  self.blender_dir, self.exports_dir]:
-            d.mkdir(parents=True, exist_ok=True)
+        # Only the root may need missing parents; everything else hangs
+        # directly off a directory created just before it.
+        self.root_path.mkdir(parents=True, exist_ok=True)
+        for d in (self.assets_dir, self.images_dir, self.audio_dir,
+                  self.video_dir, self.blender_dir, self.exports_dir):
+            d.mkdir(exist_ok=True)
 
         # Create user.md and project.md if they don't exist
         user_md = self.root_path / "user.md"
@@ -78,11 +113,11 @@ class Workspace(BaseModel):
 
     def save_manifest(self):
         """Save the project manifest to disk."""
-        data = {
-            "project_name": self.project_name,
-            "assets": {k: v.model_dump() for k, v in self.assets.items()},
-        }
-        self.manifest_path.write_text(json.dumps(data, indent=2, default=str))
+        manifest = _Manifest.model_construct(
+            project_name=self.project_name, assets=self.assets,
+        )
+        atomic_write_bytes(self.manifest_path, to_json(manifest))
+        self._dirty = False
 
     @classmethod
     def load(cls, project_path: Path) -> "Workspace":
@@ -91,32 +126,46 @@ class Workspace(BaseModel):
         if not manifest_path.exists():
             raise FileNotFoundError(f"No project.json found in {project_path}")
 
-        data = json.loads(manifest_path.read_text())
-        assets = {
-            k: AssetMetadata(**v) for k, v in data.get("assets", {}).items()
-        }
+        manifest = _Manifest.model_validate_json(manifest_path.read_bytes())
         return cls(
-            project_name=data["project_name"],
+            project_name=manifest.project_name,
             root_path=project_path,
-            assets=assets,
+            assets=manifest.assets,
         )
 
-    def register_asset(self, asset: AssetMetadata) -> AssetMetadata:
-        """Register an asset in the workspace manifest."""
+    def register_asset(self, asset: AssetMetadata, *,
+                       flush: bool = True) -> AssetMetadata:
+        """Register an asset in the workspace manifest.
+
+        With flush=False, or inside batch(), the manifest is only marked
+        dirty and written later by flush().
+        """
         self.assets[asset.asset_id] = asset
-        self.save_manifest()
+        self._dirty = True
+        if flush and not self._batch_depth:
+            self.flush()
         return asset
 
+    def flush(self):
+        """Write the manifest if assets changed since it was last saved."""
+        if self._dirty:
+            self.save_manifest()
+
+    @contextmanager
+    def batch(self) -> Iterator["Workspace"]:
+        """Defer manifest writes until the outermost batch exits."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
     def get_asset_path(self, asset_id: str) -> Optional[Path]:
         """Get the full path to an asset file."""
         asset = self.assets.get(asset_id)
         if not asset:
             return None
-        type_dirs = {
-            "image": self.images_dir,
-            "audio": self.audio_dir,
-            "video": self.video_dir,
-            "blender": self.blender_dir,
-        }
-        base_dir = type_dirs.get(asset.type, self.assets_dir)
+        base_dir = self._type_dirs.get(asset.type, self.assets_dir)
         return base_dir / asset.filename
@@ -0,0 +1,34 @@
+"""Small filesystem helpers shared by the SDK packages."""
+
+import os
+import secrets
+import stat
+from pathlib import Path
+
+# O_BINARY matters on Windows, where os.open otherwise opens in text mode
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def atomic_write_bytes(path: Path, data: bytes) -> None:
+    """Write data to path so readers never observe a partially written file.
+
+    The bytes go to a temporary file in the same directory, which is fsynced
+    and then renamed over the destination with os.replace. The destination
+    keeps its existing permissions, or gets the umask default if it is new.
+    """
+    tmp = path.with_name(f".{path.name}.{secrets.token_hex(8)}.tmp")
+    # 0o666 like open(); the kernel applies the umask, so it is never touched
+    fd = os.open(tmp, _TMP_FLAGS, 0o666)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -122,7 +122,7 @@ class TestOpenverseAuthPersistence:
 # ── OpenverseAuth register ────────────────────────────────────────────
 
 class TestOpenverseAuthRegister:
-    @patch("sdk.webscraping.auth.requests.post")
+    @patch("sdk.webscraping.http.SESSION.post")
     def test_register_success(self, mock_post, tmp_path):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -141,7 +141,7 @@ class TestOpenverseAuthRegister:
         # Should have saved to disk
         assert (tmp_path / ".credentials" / "openverse.json").exists()
 
-    @patch("sdk.webscraping.auth.requests.post")
+    @patch("sdk.webscraping.http.SESSION.post")
     def test_register_api_error(self, mock_post, tmp_path):
         mock_post.side_effect = Exception("API Error")
         auth = OpenverseAuth(repo_root=tmp_path)
@@ -152,7 +152,7 @@ class TestOpenverseAuthRegister:
 # ── OpenverseAuth token ───────────────────────────────────────────────
 
 class TestOpenverseAuthToken:
-    @patch("sdk.webscraping.auth.requests.post")
+    @patch("sdk.webscraping.http.SESSION.post")
     def test_get_token_fresh(self, mock_post, tmp_path):
         mock_resp = MagicMock()
         mock_resp.json.return_value = {
@@ -212,7 +212,7 @@ class TestOpenverseAuthEnsure:
         token = auth.ensure_authenticated()
         assert token == ""
 
-    @patch("sdk.webscraping.auth.requests.post")
+    @patch("sdk.webscraping.http.SESSION.post")
     def test_no_creds_with_email_auto_registers(self, mock_post, tmp_path):
         # First call: register, second call: token
         register_resp = MagicMock()
@@ -86,29 +86,40 @@ class TestSlide:
 
 # ── SlideCollection ─────────────────────────────────────────────────────
 
-class TestSlideCollection:
-    def _make_collection(self, n=3) -> SlideCollection:
-        c = SlideCollection()
-        for i in range(n):
-            c.add(Slide(
-                start_time=float(i * 5),
-                end_time=float(i * 5 + 5),
-                title=f"Slide {i}",
-                body_text=f"Body text for slide {i}.",
-            ))
-        return c
+def _make_collection(n=3) -> SlideCollection:
+    c = SlideCollection()
+    for i in range(n):
+        c.add(Slide(
+            start_time=float(i * 5),
+            end_time=float(i * 5 + 5),
+            title=f"Slide {i}",
+            body_text=f"Body text for slide {i}.",
+        ))
+    return c
+
+
+@pytest.fixture(scope="class")
+def baseline_collection():
+    """A 3-slide collection built once per test class. Do not mutate."""
+    return _make_collection(3)
+
+
+@pytest.fixture
+def collection(baseline_collection):
+    """A deep copy of the baseline collection, safe to mutate."""
+    return baseline_collection.model_copy(deep=True)
 
+
+class TestSlideCollection:
     # ── get ──
 
-    def test_get_existing(self):
-        c = self._make_collection()
-        slide = c.slides[1]
-        found = c.get(slide.id)
+    def test_get_existing(self, collection):
+        slide = collection.slides[1]
+        found = collection.get(slide.id)
         assert found is slide
 
-    def test_get_nonexistent(self):
-        c = self._make_collection()
-        assert c.get("nonexistent") is None
+    def test_get_nonexistent(self, collection):
+        assert collection.get("nonexistent") is None
 
     # ── add ──
 
@@ -127,24 +138,21 @@ class TestSlideCollection:
 
     # ── remove ──
 
-    def test_remove_existing(self):
-        c = self._make_collection(3)
-        target_id = c.slides[1].id
-        result = c.remove(target_id)
+    def test_remove_existing(self, collection):
+        target_id = collection.slides[1].id
+        result = collection.remove(target_id)
         assert result is True
-        assert len(c.slides) == 2
-        assert c.get(target_id) is None
+        assert len(collection.slides) == 2
+        assert collection.get(target_id) is None
 
-    def test_remove_reindexes(self):
-        c = self._make_collection(3)
-        c.remove(c.slides[0].id)
-        assert c.slides[0].order == 0
-        assert c.slides[1].order == 1
+    def test_remove_reindexes(self, collection):
+        collection.remove(collection.slides[0].id)
+        assert collection.slides[0].order == 0
+        assert collection.slides[1].order == 1
 
-    def test_remove_nonexistent(self):
-        c = self._make_collection()
-        assert c.remove("nonexistent") is False
-        assert len(c.slides) == 3
+    def test_remove_nonexistent(self, collection):
+        assert collection.remove("nonexistent") is False
+        assert len(collection.slides) == 3
 
     # ── split ──
 
@@ -163,13 +171,12 @@ class TestSlideCollection:
         assert s2.end_time == 10.0
         assert len(c.slides) == 2
 
-    def test_split_preserves_order(self):
-        c = self._make_collection(3)
-        mid_slide = c.slides[1]
+    def test_split_preserves_order(self, collection):
+        mid_slide = collection.slides[1]
         mid_time = (mid_slide.start_time + mid_slide.end_time) / 2
-        c.split(mid_slide.id, at_time=mid_time)
-        assert len(c.slides) == 4
-        for i, s in enumerate(c.slides):
+        collection.split(mid_slide.id, at_time=mid_time)
+        assert len(collection.slides) == 4
+        for i, s in enumerate(collection.slides):
             assert s.order == i
 
     def test_split_invalid_time_before_start(self):
@@ -188,22 +195,20 @@ class TestSlideCollection:
         assert c.split(s.id, at_time=5.0) is None
         assert c.split(s.id, at_time=10.0) is None
 
-    def test_split_nonexistent(self):
-        c = self._make_collection()
-        assert c.split("nonexistent", 5.0) is None
+    def test_split_nonexistent(self, collection):
+        assert collection.split("nonexistent", 5.0) is None
 
     # ── merge ──
 
-    def test_merge_adjacent(self):
-        c = self._make_collection(3)
-        id1 = c.slides[0].id
-        id2 = c.slides[1].id
-        original_end = c.slides[1].end_time
+    def test_merge_adjacent(self, collection):
+        id1 = collection.slides[0].id
+        id2 = collection.slides[1].id
+        original_end = collection.slides[1].end_time
 
-        merged = c.merge(id1, id2)
+        merged = collection.merge(id1, id2)
         assert merged is not None
         assert merged.end_time == original_end
-        assert len(c.slides) == 2
+        assert len(collection.slides) == 2
 
     def test_merge_combines_text(self):
         c = SlideCollection()
@@ -215,56 +220,55 @@ class TestSlideCollection:
         assert "Note A" in merged.speaker_notes
         assert "Note B" in merged.speaker_notes
 
-    def test_merge_reversed_order(self):
+    def test_merge_reversed_order(self, collection):
         """Merge should work regardless of argument order."""
-        c = self._make_collection(3)
-        id1 = c.slides[0].id
-        id2 = c.slides[1].id
-        merged = c.merge(id2, id1)  # reversed
+        id1 = collection.slides[0].id
+        id2 = collection.slides[1].id
+        merged = collection.merge(id2, id1)  # reversed
         assert merged is not None
-        assert len(c.slides) == 2
+        assert len(collection.slides) == 2
 
-    def test_merge_nonexistent(self):
-        c = self._make_collection()
-        assert c.merge("nonexistent", c.slides[0].id) is None
-        assert c.merge(c.slides[0].id, "nonexistent") is None
+    def test_merge_nonexistent(self, collection):
+        assert collection.merge("nonexistent", collection.slides[0].id) is None
+        assert collection.merge(collection.slides[0].id, "nonexistent") is None
 
-    def test_merge_reindexes(self):
-        c = self._make_collection(3)
-        c.merge(c.slides[0].id, c.slides[1].id)
-        for i, s in enumerate(c.slides):
+    def test_merge_reindexes(self, collection):
+        collection.merge(collection.slides[0].id, collection.slides[1].id)
+        for i, s in enumerate(collection.slides):
             assert s.order == i
 
     # ── reorder ──
 
-    def test_reorder_reverses(self):
-        c = self._make_collection(3)
-        ids = [s.id for s in c.slides]
+    def test_reorder_reverses(self, collection):
+        ids = [s.id for s in collection.slides]
         reversed_ids = list(reversed(ids))
-        assert c.reorder(reversed_ids) is True
-        assert [s.id for s in c.slides] == reversed_ids
-        for i, s in enumerate(c.slides):
+        assert collection.reorder(reversed_ids) is True
+        assert [s.id for s in collection.slides] == reversed_ids
+        for i, s in enumerate(collection.slides):
             assert s.order == i
 
-    def test_reorder_wrong_ids(self):
-        c = self._make_collection(3)
-        assert c.reorder(["a", "b", "c"]) is False
+    def test_reorder_wrong_ids(self, collection):
+        assert collection.reorder(["a", "b", "c"]) is False
 
-    def test_reorder_missing_id(self):
-        c = self._make_collection(3)
-        ids = [s.id for s in c.slides]
+    def test_reorder_missing_id(self, collection):
+        ids = [s.id for s in collection.slides]
         ids[0] = "wrong"
-        assert c.reorder(ids) is False
+        assert collection.reorder(ids) is False
+
+    def test_reorder_extra_id(self, collection):
+        ids = [s.id for s in collection.slides] + ["extra"]
+        assert collection.reorder(ids) is False
 
-    def test_reorder_extra_id(self):
-        c = self._make_collection(3)
-        ids = [s.id for s in c.slides] + ["extra"]
-        assert c.reorder(ids) is False
+    def test_reorder_duplicate_id(self, collection):
+        ids = [s.id for s in collection.slides]
+        # Same length as the collection, so only the duplicate check rejects it
+        assert collection.reorder([ids[0], ids[0], ids[2]]) is False
+        assert [s.id for s in collection.slides] == ids
 
     # ── to_summary ──
 
     def test_to_summary(self):
-        c = self._make_collection(2)
+        c = _make_collection(2)
         summary = c.to_summary()
         assert len(summary) == 2
         assert "id" in summary[0]
@@ -297,14 +301,13 @@ class TestSlideCollection:
 
     # ── serialization ──
 
-    def test_collection_json_roundtrip(self):
-        c = self._make_collection(3)
-        c.global_style = SlideStyleProps(font_color="#FF0000")
-        json_str = c.model_dump_json()
+    def test_collection_json_roundtrip(self, collection):
+        collection.global_style = SlideStyleProps(font_color="#FF0000")
+        json_str = collection.model_dump_json()
         restored = SlideCollection.model_validate_json(json_str)
         assert len(restored.slides) == 3
         assert restored.global_style.font_color == "#FF0000"
-        for orig, rest in zip(c.slides, restored.slides):
+        for orig, rest in zip(collection.slides, restored.slides):
             assert orig.id == rest.id
             assert orig.title == rest.title
             assert orig.start_time == rest.start_time
@@ -1,12 +1,38 @@
 """Tests for sdk.webscraping.images — RateLimiter, ImageSearcher, ImageResult."""
 
-import os
+import io
 import time
 import pytest
+from dataclasses import dataclass, field
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 
-from sdk.webscraping.images import RateLimiter, ImageResult, ImageSearcher, _CacheEntry
+from sdk.webscraping.images import ImageResult, ImageSearcher, RateLimiter, _CacheEntry
+
+
+@dataclass
+class _FakeResponse:
+    """Lightweight stand-in for requests.Response (cheaper than MagicMock)."""
+    payload: dict = field(default_factory=dict)
+    chunks: list[bytes] = field(default_factory=list)
+    status_code: int = 200
+
+    def __post_init__(self):
+        self.raw = io.BytesIO(b"".join(self.chunks))
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Unset every image-source API key; tests opt back in with setenv."""
+    for var in ("UNSPLASH_API_KEY", "PEXELS_API_KEY", "PIXABAY_API_KEY"):
+        monkeypatch.delenv(var, raising=False)
+    return monkeypatch
 
 
 # ── RateLimiter ─────────────────────────────────────────────────────────
@@ -23,6 +49,13 @@ class TestRateLimiter:
             assert limiter.acquire() is True
         assert limiter.acquire() is False
 
+    def test_release_returns_token(self):
+        limiter = RateLimiter(max_requests=1, period_seconds=60)
+        assert limiter.acquire() is True
+        limiter.release()
+        assert limiter.acquire() is True
+        assert limiter.acquire() is False
+
     def test_tokens_refill_over_time(self):
         limiter = RateLimiter(max_requests=10, period_seconds=1.0)
         # Drain all tokens
@@ -31,9 +64,30 @@ class TestRateLimiter:
         assert limiter.acquire() is False
 
         # Simulate time passing
-        limiter.last_refill = time.time() - 1.1
+        limiter.last_refill_ns -= 1_100_000_000
         assert limiter.acquire() is True
 
+    def test_partial_refill_keeps_remainder(self):
+        limiter = RateLimiter(max_requests=10, period_seconds=1.0)
+        limiter.tokens = 0
+        start = limiter.last_refill_ns - 150_000_000
+        limiter.last_refill_ns = start
+        assert limiter.acquire() is True
+        assert limiter.tokens == 0
+        assert limiter.last_refill_ns == start + 100_000_000
+
+    def test_acquire_waits_for_refill(self):
+        limiter = RateLimiter(max_requests=100, period_seconds=1.0)  # 10 ms/token
+        limiter.tokens = 0
+        assert limiter.acquire(max_wait=0.5) is True
+        assert limiter.tokens == -1  # reserved ahead of the refill
+
+    def test_acquire_gives_up_past_max_wait(self):
+        limiter = RateLimiter(max_requests=1, period_seconds=60)
+        limiter.tokens = 0
+        assert limiter.acquire(max_wait=0.01) is False
+        assert limiter.tokens == 0
+
     def test_single_token(self):
         limiter = RateLimiter(max_requests=1, period_seconds=60)
         assert limiter.acquire() is True
@@ -73,85 +127,92 @@ class TestImageResult:
 # ── ImageSearcher source status ─────────────────────────────────────────
 
 class TestImageSearcherStatus:
-    def test_no_keys_configured(self):
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher()
-            status = searcher.get_source_status()
-            assert status["unsplash"]["configured"] is False
-            assert status["pexels"]["configured"] is False
-            assert status["pixabay"]["configured"] is False
-
-    def test_some_keys_configured(self):
-        env = {"UNSPLASH_API_KEY": "test_key"}
-        with patch.dict(os.environ, env, clear=True):
-            searcher = ImageSearcher()
-            status = searcher.get_source_status()
-            assert status["unsplash"]["configured"] is True
-            assert status["pexels"]["configured"] is False
-
-    def test_all_keys_configured(self):
-        env = {
-            "UNSPLASH_API_KEY": "key1",
-            "PEXELS_API_KEY": "key2",
-            "PIXABAY_API_KEY": "key3",
-        }
-        with patch.dict(os.environ, env, clear=True):
-            searcher = ImageSearcher()
-            status = searcher.get_source_status()
-            for source in ["unsplash", "pexels", "pixabay"]:
-                assert status[source]["configured"] is True
+    def test_no_keys_configured(self, clean_env):
+        searcher = ImageSearcher()
+        status = searcher.get_source_status()
+        assert status["unsplash"]["configured"] is False
+        assert status["pexels"]["configured"] is False
+        assert status["pixabay"]["configured"] is False
+
+    def test_some_keys_configured(self, clean_env):
+        clean_env.setenv("UNSPLASH_API_KEY", "test_key")
+
+        searcher = ImageSearcher()
+        status = searcher.get_source_status()
+        assert status["unsplash"]["configured"] is True
+        assert status["pexels"]["configured"] is False
+
+    def test_all_keys_configured(self, clean_env):
+        clean_env.setenv("UNSPLASH_API_KEY", "key1")
+        clean_env.setenv("PEXELS_API_KEY", "key2")
+        clean_env.setenv("PIXABAY_API_KEY", "key3")
+
+        searcher = ImageSearcher()
+        status = searcher.get_source_status()
+        for source in ["unsplash", "pexels", "pixabay"]:
+            assert status[source]["configured"] is True
+
+    def test_close_shuts_down_search_pool(self, clean_env):
+        searcher = ImageSearcher()
+        searcher.close()
+        with pytest.raises(RuntimeError):
+            searcher._pool.submit(lambda: None)
 
 
 # ── ImageSearcher search ────────────────────────────────────────────────
 
 class TestImageSearcherSearch:
-    def test_search_no_keys_returns_empty(self):
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher()
-            results = searcher.search("sunset")
-            assert results == []
-
-    def test_search_uses_cache(self):
-        with patch.dict(os.environ, {"UNSPLASH_API_KEY": "key"}, clear=True):
-            searcher = ImageSearcher()
-            fake_result = ImageResult(
-                id="cached", source="unsplash",
-                preview_url="p", full_url="f", download_url="d",
-                width=800, height=600,
-            )
-            # Manually populate cache
-            from sdk.webscraping.images import _CacheEntry
-            searcher._cache["sunset:5:landscape"] = _CacheEntry(
-                results=[fake_result], timestamp=time.time(),
-            )
+    def test_search_no_keys_returns_empty(self, clean_env):
+        searcher = ImageSearcher()
+        results = searcher.search("sunset")
+        assert results == []
 
-            results = searcher.search("sunset", count=5, orientation="landscape")
-            assert len(results) == 1
-            assert results[0].id == "cached"
+    def test_search_uses_cache(self, clean_env):
+        clean_env.setenv("UNSPLASH_API_KEY", "key")
 
-    def test_search_cache_expires(self):
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher()
-            from sdk.webscraping.images import _CacheEntry
-            fake_result = ImageResult(
-                id="old", source="unsplash",
-                preview_url="p", full_url="f", download_url="d",
-                width=800, height=600,
-            )
-            # Expired cache entry (16 minutes ago)
-            searcher._cache["test:5:landscape"] = _CacheEntry(
-                results=[fake_result], timestamp=time.time() - 960,
-            )
+        searcher = ImageSearcher()
+        fake_result = ImageResult(
+            id="cached", source="unsplash",
+            preview_url="p", full_url="f", download_url="d",
+            width=800, height=600,
+        )
+        # Manually populate cache
+        searcher._cache["sunset:5:landscape"] = _CacheEntry(
+            results=[fake_result], timestamp=time.monotonic(),
+        )
+
+        results = searcher.search("sunset", count=5, orientation="landscape")
+        assert len(results) == 1
+        assert results[0].id == "cached"
+
+    def test_search_cache_expires(self, clean_env):
+        searcher = ImageSearcher()
+        fake_result = ImageResult(
+            id="old", source="unsplash",
+            preview_url="p", full_url="f", download_url="d",
+            width=800, height=600,
+        )
+        # Expired cache entry (16 minutes ago)
+        searcher._cache["test:5:landscape"] = _CacheEntry(
+            results=[fake_result], timestamp=time.monotonic() - 960,
+        )
 
-            results = searcher.search("test", count=5, orientation="landscape")
-            # No API keys, so should return empty even though cache existed
-            assert results == []
+        results = searcher.search("test", count=5, orientation="landscape")
+        # No API keys, so should return empty even though cache existed
+        assert results == []
 
-    @patch("sdk.webscraping.images.requests.get")
-    def test_search_unsplash_parses_response(self, mock_get):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+    def test_search_cache_evicts_least_recently_used(self, clean_env):
+        searcher = ImageSearcher()
+        searcher.CACHE_MAX = 2
+        searcher.search("a")
+        searcher.search("b")
+        searcher.search("a")  # refresh "a" so "b" becomes the oldest
+        searcher.search("c")
+        assert list(searcher._cache) == ["a:5:landscape", "c:5:landscape"]
+
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_search_unsplash_parses_response(self, mock_get, clean_env):
+        mock_get.return_value = _FakeResponse(payload={
             "results": [{
                 "id": "photo1",
                 "urls": {
@@ -163,23 +224,20 @@ class TestImageSearcherSearch:
                 "height": 1080,
                 "user": {"name": "Test Photographer"},
             }]
-        }
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        with patch.dict(os.environ, {"UNSPLASH_API_KEY": "test_key"}, clear=True):
-            searcher = ImageSearcher()
-            results = searcher.search("nature", count=1)
-            assert len(results) == 1
-            assert results[0].source == "unsplash"
-            assert results[0].photographer == "Test Photographer"
-            assert results[0].width == 1920
-
-    @patch("sdk.webscraping.images.requests.get")
-    def test_search_pexels_parses_response(self, mock_get):
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        })
+
+        clean_env.setenv("UNSPLASH_API_KEY", "test_key")
+
+        searcher = ImageSearcher()
+        results = searcher.search("nature", count=1)
+        assert len(results) == 1
+        assert results[0].source == "unsplash"
+        assert results[0].photographer == "Test Photographer"
+        assert results[0].width == 1920
+
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_search_pexels_parses_response(self, mock_get, clean_env):
+        mock_get.return_value = _FakeResponse(payload={
             "photos": [{
                 "id": 12345,
                 "src": {
@@ -191,55 +249,106 @@ class TestImageSearcherSearch:
                 "height": 1440,
                 "photographer": "Pexels User",
             }]
+        })
+
+        clean_env.setenv("PEXELS_API_KEY", "test_key")
+
+        searcher = ImageSearcher()
+        results = searcher.search("ocean", count=1)
+        assert len(results) == 1
+        assert results[0].source == "pexels"
+        assert results[0].id == "12345"
+
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_search_pixabay_parses_response(self, mock_get, clean_env):
+        mock_get.return_value = _FakeResponse(payload={
+            "hits": [{
+                "id": 42,
+                "webformatURL": "https://example.com/web.jpg",
+                "largeImageURL": "https://example.com/large.jpg",
+                "imageWidth": 1920,
+                "imageHeight": 1280,
+                "user": "Pixabay User",
+            }]
+        })
+
+        clean_env.setenv("PIXABAY_API_KEY", "test_key")
+
+        searcher = ImageSearcher()
+        results = searcher.search("forest", count=1, min_width=1920)
+        assert len(results) == 1
+        assert results[0].source == "pixabay"
+        assert results[0].id == "42"
+        assert results[0].download_url == "https://example.com/large.jpg"
+        assert mock_get.call_args.kwargs["params"]["min_width"] == 1920
+
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_search_merges_sources_in_order(self, mock_get, clean_env):
+        payloads = {
+            "https://api.unsplash.com/search/photos": {"results": [{
+                "id": "u1",
+                "urls": {"small": "s", "regular": "r", "full": "f"},
+                "width": 1920, "height": 1080,
+            }]},
+            "https://api.pexels.com/v1/search": {"photos": [{
+                "id": 7,
+                "src": {"medium": "m", "large2x": "l", "original": "o"},
+                "width": 1920, "height": 1080,
+            }]},
         }
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        with patch.dict(os.environ, {"PEXELS_API_KEY": "test_key"}, clear=True):
-            searcher = ImageSearcher()
-            results = searcher.search("ocean", count=1)
-            assert len(results) == 1
-            assert results[0].source == "pexels"
-            assert results[0].id == "12345"
-
-    @patch("sdk.webscraping.images.requests.get")
-    def test_search_handles_api_error(self, mock_get):
+        mock_get.side_effect = lambda url, **kw: _FakeResponse(payload=payloads[url])
+
+        clean_env.setenv("UNSPLASH_API_KEY", "key")
+        clean_env.setenv("PEXELS_API_KEY", "key")
+
+        searcher = ImageSearcher()
+        results = searcher.search("city", count=2)
+        assert [r.source for r in results] == ["unsplash", "pexels"]
+        assert mock_get.call_count == 2
+
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_search_handles_api_error(self, mock_get, clean_env):
         mock_get.side_effect = Exception("API Error")
 
-        with patch.dict(os.environ, {"UNSPLASH_API_KEY": "key"}, clear=True):
-            searcher = ImageSearcher()
-            results = searcher.search("test")
-            assert results == []
-
-    def test_search_respects_count(self):
-        with patch.dict(os.environ, {"UNSPLASH_API_KEY": "key"}, clear=True):
-            searcher = ImageSearcher()
-            from sdk.webscraping.images import _CacheEntry
-            fake_results = [
-                ImageResult(
-                    id=f"r{i}", source="unsplash",
-                    preview_url="p", full_url="f", download_url="d",
-                    width=800, height=600,
-                )
-                for i in range(10)
-            ]
-            searcher._cache["test:3:landscape"] = _CacheEntry(
-                results=fake_results, timestamp=time.time(),
+        clean_env.setenv("UNSPLASH_API_KEY", "key")
+
+        searcher = ImageSearcher()
+        results = searcher.search("test")
+        assert results == []
+
+    def test_search_respects_count(self, clean_env):
+        clean_env.setenv("UNSPLASH_API_KEY", "key")
+
+        searcher = ImageSearcher()
+        fake_results = [
+            ImageResult(
+                id=f"r{i}", source="unsplash",
+                preview_url="p", full_url="f", download_url="d",
+                width=800, height=600,
             )
+            for i in range(10)
+        ]
+        searcher._cache["test:3:landscape"] = _CacheEntry(
+            results=fake_results, timestamp=time.monotonic(),
+        )
 
-            results = searcher.search("test", count=3, orientation="landscape")
-            assert len(results) == 3
+        results = searcher.search("test", count=3, orientation="landscape")
+        assert len(results) == 3
 
 
 # ── ImageSearcher download ──────────────────────────────────────────────
 
+@pytest.fixture
+def mock_download_get():
+    """Patch the shared SESSION.get used by images.py to stream back a single fake chunk."""
+    with patch("sdk.webscraping.http.SESSION.get",
+               return_value=_FakeResponse(chunks=[b"data"])) as mock_get:
+        yield mock_get
+
+
 class TestImageSearcherDownload:
-    @patch("sdk.webscraping.images.requests.get")
-    def test_download_creates_file(self, mock_get, tmp_path):
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b"fake image data"]
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+    def test_download_creates_file(self, mock_download_get, tmp_path):
+        mock_download_get.return_value = _FakeResponse(chunks=[b"fake image data"])
 
         searcher = ImageSearcher()
         result = searcher.download(
@@ -252,29 +361,7 @@ class TestImageSearcherDownload:
         assert result.name == "test.jpg"
         assert result.read_bytes() == b"fake image data"
 
-    @patch("sdk.webscraping.images.requests.get")
-    def test_download_auto_filename(self, mock_get, tmp_path):
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b"data"]
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
-        searcher = ImageSearcher()
-        result = searcher.download(
-            "https://example.com/photo.jpg",
-            tmp_path / "images",
-        )
-
-        assert result.exists()
-        assert result.suffix == ".jpg"
-
-    @patch("sdk.webscraping.images.requests.get")
-    def test_download_creates_directory(self, mock_get, tmp_path):
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b"data"]
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
-
+    def test_download_creates_directory(self, mock_download_get, tmp_path):
         searcher = ImageSearcher()
         dest = tmp_path / "new_dir" / "sub"
         result = searcher.download("https://example.com/img.png", dest, "f.png")
@@ -282,39 +369,27 @@ class TestImageSearcherDownload:
         assert dest.exists()
         assert result.exists()
 
-    @patch("sdk.webscraping.images.requests.get")
-    def test_download_detects_png_extension(self, mock_get, tmp_path):
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b"data"]
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+    @pytest.mark.parametrize("url, expected_suffix", [
+        ("https://example.com/photo.jpg", ".jpg"),
+        ("https://example.com/photo.PNG?w=500", ".png"),
+        ("https://example.com/photo.webp", ".webp"),
+        ("https://example.com/photo.jpeg", ".jpeg"),
+        ("https://example.com/photo?fm=png", ".jpg"),
+    ])
+    def test_download_auto_filename_extension(self, mock_download_get, tmp_path,
+                                              url, expected_suffix):
 
         searcher = ImageSearcher()
-        result = searcher.download(
-            "https://example.com/photo.PNG?w=500",
-            tmp_path,
-        )
-        assert result.suffix == ".png"
-
-    @patch("sdk.webscraping.images.requests.get")
-    def test_download_detects_webp_extension(self, mock_get, tmp_path):
-        mock_response = MagicMock()
-        mock_response.iter_content.return_value = [b"data"]
-        mock_response.raise_for_status = MagicMock()
-        mock_get.return_value = mock_response
+        result = searcher.download(url, tmp_path / "images")
 
-        searcher = ImageSearcher()
-        result = searcher.download(
-            "https://example.com/photo.webp",
-            tmp_path,
-        )
-        assert result.suffix == ".webp"
+        assert result.exists()
+        assert result.suffix == expected_suffix
 
 
 # ── ImageSearcher Openverse fallback ───────────────────────────────────
 
 class TestImageSearcherOpenverseFallback:
-    def test_uses_openverse_when_no_api_keys(self):
+    def test_uses_openverse_when_no_api_keys(self, clean_env):
         mock_ov = MagicMock()
         mock_ov.search_images.return_value = [
             ImageResult(
@@ -324,27 +399,23 @@ class TestImageSearcherOpenverseFallback:
             ),
         ]
 
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher(openverse_client=mock_ov)
-            results = searcher.search("sunset", count=1)
-            assert len(results) == 1
-            assert results[0].source == "openverse"
-            mock_ov.search_images.assert_called_once()
+        searcher = ImageSearcher(openverse_client=mock_ov)
+        results = searcher.search("sunset", count=1)
+        assert len(results) == 1
+        assert results[0].source == "openverse"
+        mock_ov.search_images.assert_called_once()
 
-    @patch("sdk.webscraping.images.requests.get")
-    def test_openverse_supplements_partial_results(self, mock_get):
+    @patch("sdk.webscraping.http.SESSION.get")
+    def test_openverse_supplements_partial_results(self, mock_get, clean_env):
         # Unsplash returns 1 result, need 3 total → Openverse fills remaining
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {
+        mock_get.return_value = _FakeResponse(payload={
             "results": [{
                 "id": "u1",
                 "urls": {"small": "s", "regular": "r", "full": "f"},
                 "width": 1920, "height": 1080,
                 "user": {"name": "P"},
             }]
-        }
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+        })
 
         mock_ov = MagicMock()
         mock_ov.search_images.return_value = [
@@ -360,26 +431,26 @@ class TestImageSearcherOpenverseFallback:
             ),
         ]
 
-        with patch.dict(os.environ, {"UNSPLASH_API_KEY": "key"}, clear=True):
-            searcher = ImageSearcher(openverse_client=mock_ov)
-            results = searcher.search("nature", count=3)
-            assert len(results) == 3
-            assert results[0].source == "unsplash"
-            assert results[1].source == "openverse"
-            mock_ov.search_images.assert_called_once_with(
-                "nature", count=2, orientation="landscape",
-            )
+        clean_env.setenv("UNSPLASH_API_KEY", "key")
+
+        searcher = ImageSearcher(openverse_client=mock_ov)
+        results = searcher.search("nature", count=3)
+        assert len(results) == 3
+        assert results[0].source == "unsplash"
+        assert results[1].source == "openverse"
+        mock_ov.search_images.assert_called_once_with(
+            "nature", count=2, orientation="landscape",
+        )
 
-    def test_openverse_error_handled_gracefully(self):
+    def test_openverse_error_handled_gracefully(self, clean_env):
         mock_ov = MagicMock()
         mock_ov.search_images.side_effect = Exception("Openverse down")
 
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher(openverse_client=mock_ov)
-            results = searcher.search("test", count=5)
-            assert results == []
+        searcher = ImageSearcher(openverse_client=mock_ov)
+        results = searcher.search("test", count=5)
+        assert results == []
 
-    def test_openverse_status_included(self):
+    def test_openverse_status_included(self, clean_env):
         mock_ov = MagicMock()
         mock_ov.get_status.return_value = {
             "source": "openverse",
@@ -387,14 +458,12 @@ class TestImageSearcherOpenverseFallback:
             "remaining_requests": 18,
         }
 
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher(openverse_client=mock_ov)
-            status = searcher.get_source_status()
-            assert "openverse" in status
-            assert status["openverse"]["source"] == "openverse"
-
-    def test_no_openverse_client_no_fallback(self):
-        with patch.dict(os.environ, {}, clear=True):
-            searcher = ImageSearcher()
-            results = searcher.search("sunset")
-            assert results == []
+        searcher = ImageSearcher(openverse_client=mock_ov)
+        status = searcher.get_source_status()
+        assert "openverse" in status
+        assert status["openverse"]["source"] == "openverse"
+
+    def test_no_openverse_client_no_fallback(self, clean_env):
+        searcher = ImageSearcher()
+        results = searcher.search("sunset")
+        assert results == []
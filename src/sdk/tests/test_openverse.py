@@ -1,12 +1,133 @@
 """Tests for sdk.webscraping.openverse — OpenverseClient, AudioResult."""
 
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
 import time
 import pytest
 from pathlib import Path
-from unittest.mock import patch, MagicMock
-
-from sdk.webscraping.openverse import AudioResult, OpenverseClient
-from sdk.webscraping.images import ImageResult
+from unittest.mock import MagicMock
+
+import requests
+
+from sdk.webscraping.openverse import (
+    AudioResult, OpenverseClient, _CacheEntry, _cache_key,
+)
+
+
+# Class attributes plus the per-instance ones (raw, headers, ...) that
+# Response only assigns in __init__.
+_RESPONSE_ATTRS = sorted({*dir(requests.Response), *vars(requests.Response())})
+
+
+def _mk_resp(json_data=None, chunks: tuple[bytes, ...] = (),
+             headers: dict | None = None, status_code: int = 200) -> MagicMock:
+    """A requests.Response double; spec_set rejects attributes Response lacks."""
+    resp = MagicMock(spec_set=_RESPONSE_ATTRS)
+    resp.content = json.dumps(json_data).encode()
+    resp.raw = io.BytesIO(b"".join(chunks))
+    resp.headers = headers or {}
+    resp.status_code = status_code
+    resp.__enter__.return_value = resp
+    return resp
+
+
+# Canned API payloads shared by the search tests, served as the encoded
+# response body.
+_IMG_RESP = {
+    "results": [{
+        "id": "img1",
+        "thumbnail": "https://example.com/thumb.jpg",
+        "url": "https://example.com/full.jpg",
+        "width": 1920,
+        "height": 1080,
+        "creator": "Photographer",
+        "license": "CC-BY",
+    }]
+}
+_AUD_RESP = {
+    "results": [{
+        "id": "aud1",
+        "source": "freesound",
+        "title": "Rain",
+        "thumbnail": "https://example.com/thumb.jpg",
+        "url": "https://example.com/audio.mp3",
+        "duration": 45.0,
+        "creator": "SoundArtist",
+        "license": "CC-BY",
+        "license_url": "https://creativecommons.org/licenses/by/4.0/",
+        "tags": [
+            {"name": "rain"},
+            {"name": "nature"},
+            {"name": "ambient"},
+        ],
+    }]
+}
+_EMPTY_RESP = {"results": []}
+
+# One response object reused by every test that only inspects outgoing params.
+_EMPTY_GET_RESP = _mk_resp(_EMPTY_RESP)
+
+# Streamed download bodies, joined into the fake response.raw.
+_CHUNKS_IMG = (b"fake image data",)
+_CHUNKS_AUDIO = (b"audio data",)
+_CHUNKS_WAV = (b"wav data",)
+_CHUNKS_SMALL = (b"data",)
+
+
+@pytest.fixture(scope="module")
+def shared_client():
+    """One OpenverseClient for the whole module; see `client`."""
+    return OpenverseClient()
+
+
+@pytest.fixture
+def client(shared_client):
+    """The module's OpenverseClient, reset to a clean state for each test."""
+    shared_client._cache.clear()
+    shared_client._token = ""
+    shared_client._rate_limiter.tokens = shared_client._rate_limiter.max_requests
+    return shared_client
+
+
+@pytest.fixture
+def mock_get(monkeypatch):
+    """Stand-in for Session.get, which every OpenverseClient goes through."""
+    mock = MagicMock()
+    monkeypatch.setattr(requests.Session, "get", mock)
+    return mock
+
+
+@pytest.fixture
+def empty_get(mock_get):
+    """mock_get answering every call with the shared empty-result response."""
+    mock_get.return_value = _EMPTY_GET_RESP
+    return mock_get
+
+
+@pytest.fixture
+def mock_download(mock_get):
+    """Factory: make Session.get return a response streaming `chunks`."""
+    def _stream(chunks: tuple[bytes, ...]) -> MagicMock:
+        resp = _mk_resp(chunks=chunks)
+        mock_get.return_value = resp
+        return resp
+    return _stream
+
+
+@pytest.fixture
+def fast_tmp(tmp_path_factory):
+    """Scratch dir on tmpfs (/dev/shm) on Linux, else a regular pytest tmp dir."""
+    shm = Path("/dev/shm")
+    if sys.platform == "linux" and shm.is_dir() and os.access(shm, os.W_OK):
+        root = Path(tempfile.mkdtemp(prefix="pytest-dl-", dir=shm))
+        yield root
+        shutil.rmtree(root, ignore_errors=True)
+    else:
+        yield tmp_path_factory.mktemp("dl")
 
 
 # ── AudioResult ────────────────────────────────────────────────────────
@@ -53,24 +174,9 @@ class TestAudioResult:
 # ── OpenverseClient image search ───────────────────────────────────────
 
 class TestOpenverseClientImageSearch:
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_parse_response(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {
-            "results": [{
-                "id": "img1",
-                "thumbnail": "https://example.com/thumb.jpg",
-                "url": "https://example.com/full.jpg",
-                "width": 1920,
-                "height": 1080,
-                "creator": "Photographer",
-                "license": "CC-BY",
-            }]
-        }
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_parse_response(self, mock_get, client):
+        mock_get.return_value = _mk_resp(_IMG_RESP)
 
-        client = OpenverseClient()
         results = client.search_images("sunset", count=1)
 
         assert len(results) == 1
@@ -78,41 +184,81 @@ class TestOpenverseClientImageSearch:
         assert results[0].width == 1920
         assert results[0].photographer == "Photographer"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_empty_results(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_empty_results(self, empty_get, client):
         results = client.search_images("xyznonexistent")
         assert results == []
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_api_error(self, mock_get):
+    def test_api_error(self, mock_get, client):
         mock_get.side_effect = Exception("API Error")
 
-        client = OpenverseClient()
         with pytest.raises(Exception, match="API Error"):
             client.search_images("test")
 
-    @patch("sdk.webscraping.openverse.requests.get")
+    def test_cache_evicts_least_recently_used(self, empty_get, client, monkeypatch):
+        monkeypatch.setattr(client, "CACHE_MAX", 2)
+        client.search_images("a")
+        client.search_images("b")
+        client.search_images("a")  # refresh "a" so "b" becomes the oldest
+        client.search_images("c")
+        assert list(client._cache) == [
+            _cache_key("img", query=q, count=5, orientation="landscape")
+            for q in ("a", "c")
+        ]
+
+    def test_cache_sweep_drops_expired_entries(self, empty_get, client, monkeypatch):
+        monkeypatch.setattr(client, "CACHE_SWEEP_EVERY", 1)
+        client._cache[_cache_key("img", query="stale")] = _CacheEntry(
+            results=[], timestamp=time.monotonic() - client.CACHE_TTL,
+        )
+        client.search_images("fresh")
+        assert list(client._cache) == [
+            _cache_key("img", query="fresh", count=5, orientation="landscape"),
+        ]
+
+    def test_search_images_batch_keeps_query_order(self, mock_get, client):
+        def respond(url, params, **kwargs):
+            return _mk_resp({"results": [{"id": params["q"]}]})
+        mock_get.side_effect = respond
+
+        batches = client.search_images_batch(["a", "b", "c"], count=1)
+        assert [[r.id for r in batch] for batch in batches] == [["a"], ["b"], ["c"]]
+
+    def test_search_images_batch_waits_out_empty_bucket(self, mock_get, client,
+                                                        monkeypatch):
+        # Real 18/60 limiter, drained: one token every 3.33 s
+        limiter = client._rate_limiter
+        limiter.tokens = 0
+        limiter.last_refill_ns = time.monotonic_ns()
+        sleeps = []
+        monkeypatch.setattr(time, "sleep", sleeps.append)
+
+        def respond(url, params, **kwargs):
+            return _mk_resp({"results": [{"id": params["q"]}]})
+        mock_get.side_effect = respond
+
+        queries = [f"q{i}" for i in range(8)]
+        batches = client.search_images_batch(queries, count=1)
+
+        assert [[r.id for r in batch] for batch in batches] == [[q] for q in queries]
+        assert len(sleeps) == 8
+        assert max(sleeps) > 8 * 60 / 18 - 1
+
+    def test_search_images_batch_empty(self, mock_get, client):
+        assert client.search_images_batch([]) == []
+        mock_get.assert_not_called()
+
+    def test_empty_results_cached_briefly(self, empty_get, client):
+        client.search_images("nothing")
+        client.search_images("nothing")
+        assert empty_get.call_count == 1
+
+        key = _cache_key("img", query="nothing", count=5, orientation="landscape")
+        client._cache[key].timestamp -= client.NEGATIVE_TTL
+        client.search_images("nothing")
+        assert empty_get.call_count == 2
+
     def test_cache_hit(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {
-            "results": [{
-                "id": "img1",
-                "thumbnail": "t",
-                "url": "u",
-                "width": 100,
-                "height": 100,
-                "creator": "",
-                "license": "CC",
-            }]
-        }
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+        mock_get.return_value = _mk_resp(_IMG_RESP)
 
         client = OpenverseClient()
         # First call hits API
@@ -122,62 +268,27 @@ class TestOpenverseClientImageSearch:
 
         assert mock_get.call_count == 1
         assert len(results2) == 1
+        assert results2 is results1  # served without copying
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_orientation_mapping(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_orientation_mapping(self, empty_get, client):
         client.search_images("test", orientation="landscape")
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert call_args[1]["params"]["aspect_ratio"] == "wide"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_portrait_orientation_mapping(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_portrait_orientation_mapping(self, empty_get, client):
         client.search_images("test", orientation="portrait")
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert call_args[1]["params"]["aspect_ratio"] == "tall"
 
 
 # ── OpenverseClient audio search ──────────────────────────────────────
 
 class TestOpenverseClientAudioSearch:
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_parse_response_with_tags(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {
-            "results": [{
-                "id": "aud1",
-                "source": "freesound",
-                "title": "Rain",
-                "thumbnail": "https://example.com/thumb.jpg",
-                "url": "https://example.com/audio.mp3",
-                "duration": 45.0,
-                "creator": "SoundArtist",
-                "license": "CC-BY",
-                "license_url": "https://creativecommons.org/licenses/by/4.0/",
-                "tags": [
-                    {"name": "rain"},
-                    {"name": "nature"},
-                    {"name": "ambient"},
-                ],
-            }]
-        }
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_parse_response_with_tags(self, mock_get, client):
+        mock_get.return_value = _mk_resp(_AUD_RESP)
 
-        client = OpenverseClient()
         results = client.search_audio("rain", count=1)
 
         assert len(results) == 1
@@ -185,73 +296,40 @@ class TestOpenverseClientAudioSearch:
         assert results[0].duration == 45.0
         assert results[0].tags == ["rain", "nature", "ambient"]
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_duration_filter_shortest(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_duration_filter_shortest(self, empty_get, client):
         client.search_audio("test", duration_max=20)
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert call_args[1]["params"]["length"] == "shortest"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_duration_filter_short(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_duration_filter_short(self, empty_get, client):
         client.search_audio("test", duration_max=60)
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert call_args[1]["params"]["length"] == "short"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_duration_filter_medium(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_duration_filter_medium(self, empty_get, client):
         client.search_audio("test", duration_max=300)
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert call_args[1]["params"]["length"] == "medium"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_no_duration_filter(self, mock_get):
-        mock_resp = MagicMock()
-        mock_resp.json.return_value = {"results": []}
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
-
-        client = OpenverseClient()
+    def test_no_duration_filter(self, empty_get, client):
         client.search_audio("test")
 
-        call_args = mock_get.call_args
+        call_args = empty_get.call_args
         assert "length" not in call_args[1]["params"]
 
 
 # ── OpenverseClient download ──────────────────────────────────────────
 
 class TestOpenverseClientDownload:
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_download_image(self, mock_get, tmp_path):
-        mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"fake image data"]
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_download_image(self, mock_download, fast_tmp, client):
+        mock_download(_CHUNKS_IMG)
 
-        client = OpenverseClient()
         result = client.download(
             "https://example.com/photo.jpg",
-            tmp_path / "images",
+            fast_tmp / "images",
             filename="test.jpg",
         )
 
@@ -259,79 +337,180 @@ class TestOpenverseClientDownload:
         assert result.name == "test.jpg"
         assert result.read_bytes() == b"fake image data"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_download_audio_auto_extension(self, mock_get, tmp_path):
-        mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"audio data"]
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_download_streams_raw_with_decoding(self, mock_download, fast_tmp,
+                                                 mock_get, client):
+        resp = mock_download(_CHUNKS_AUDIO)
+
+        client.download("https://example.com/track.mp3", fast_tmp / "audio")
+
+        assert mock_get.call_args.kwargs["stream"] is True
+        assert mock_get.call_args.kwargs["headers"]["Accept-Encoding"] == "identity"
+        assert resp.raw.decode_content is True
+
+    def test_download_large_file_in_parallel_ranges(self, mock_get, fast_tmp,
+                                                     client, monkeypatch):
+        monkeypatch.setattr(client, "RANGED_DOWNLOAD_MIN", 8)
+        body = bytes(range(16))
+
+        def respond(url, headers, **kwargs):
+            if "Range" not in headers:
+                return _mk_resp(chunks=(body,), headers={
+                    "Content-Length": str(len(body)), "Accept-Ranges": "bytes",
+                })
+            lo, hi = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+            return _mk_resp(chunks=(body[lo:hi + 1],), status_code=206)
+        mock_get.side_effect = respond
+
+        result = client.download("https://example.com/long.mp3", fast_tmp / "audio")
+
+        assert result.read_bytes() == body
+        ranges = sorted(c.kwargs["headers"]["Range"] for c in mock_get.call_args_list[1:])
+        assert ranges == ["bytes=12-15", "bytes=4-7", "bytes=8-11"]
+
+    def test_download_ranged_failure_removes_file(self, mock_get, fast_tmp,
+                                                  client, monkeypatch):
+        monkeypatch.setattr(client, "RANGED_DOWNLOAD_MIN", 8)
+        body = bytes(range(16))
+
+        def respond(url, headers, **kwargs):
+            if "Range" not in headers:
+                return _mk_resp(chunks=(body,), headers={
+                    "Content-Length": str(len(body)), "Accept-Ranges": "bytes",
+                })
+            # Every part comes back one byte short
+            lo, hi = map(int, headers["Range"].removeprefix("bytes=").split("-"))
+            return _mk_resp(chunks=(body[lo:hi],), status_code=206)
+        mock_get.side_effect = respond
+
+        with pytest.raises(IOError):
+            client.download("https://example.com/long.mp3", fast_tmp,
+                            filename="long.mp3")
+
+        assert not (fast_tmp / "long.mp3").exists()
+
+    def test_download_falls_back_when_ranges_ignored(self, mock_get, fast_tmp,
+                                                     client, monkeypatch):
+        monkeypatch.setattr(client, "RANGED_DOWNLOAD_MIN", 8)
+        body = bytes(range(16))
+        # Advertises byte ranges, then answers Range requests with a full 200
+        mock_get.side_effect = lambda url, headers, **kwargs: _mk_resp(
+            chunks=(body,),
+            headers={"Content-Length": str(len(body)), "Accept-Ranges": "bytes"},
+        )
+
+        result = client.download("https://example.com/long.mp3", fast_tmp)
+
+        assert result.read_bytes() == body
+        plain = [c for c in mock_get.call_args_list
+                 if "Range" not in c.kwargs["headers"]]
+        assert len(plain) == 2
+
+    def test_download_trims_preallocation_to_body(self, mock_get, fast_tmp, client):
+        # Content-Length overstates the body; the reserved tail is cut off
+        mock_get.return_value = _mk_resp(
+            chunks=_CHUNKS_SMALL, headers={"Content-Length": "1024"},
+        )
+
+        result = client.download("https://example.com/a.mp3", fast_tmp)
+
+        assert result.read_bytes() == b"data"
+
+    def test_download_stream_failure_removes_file(self, mock_get, fast_tmp, client):
+        resp = _mk_resp(chunks=_CHUNKS_SMALL, headers={"Content-Length": "1024"})
+        resp.raw = MagicMock()
+        resp.raw.read.side_effect = ConnectionError("reset")
+        mock_get.return_value = resp
+
+        with pytest.raises(ConnectionError):
+            client.download("https://example.com/a.mp3", fast_tmp, filename="a.mp3")
+
+        assert not (fast_tmp / "a.mp3").exists()
+
+    def test_download_audio_auto_extension(self, mock_download, fast_tmp, client):
+        mock_download(_CHUNKS_AUDIO)
 
-        client = OpenverseClient()
         result = client.download(
             "https://example.com/track.mp3",
-            tmp_path / "audio",
+            fast_tmp / "audio",
         )
 
         assert result.exists()
         assert result.suffix == ".mp3"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_download_wav_extension(self, mock_get, tmp_path):
-        mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"wav data"]
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_download_wav_extension(self, mock_download, fast_tmp, client):
+        mock_download(_CHUNKS_WAV)
 
-        client = OpenverseClient()
         result = client.download(
             "https://example.com/sound.wav?dl=1",
-            tmp_path / "audio",
+            fast_tmp / "audio",
         )
 
         assert result.exists()
         assert result.suffix == ".wav"
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_download_creates_directory(self, mock_get, tmp_path):
-        mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"data"]
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_download_creates_directory(self, mock_download, fast_tmp, client):
+        mock_download(_CHUNKS_SMALL)
 
-        client = OpenverseClient()
-        dest = tmp_path / "new" / "nested" / "dir"
+        dest = fast_tmp / "new" / "nested" / "dir"
         result = client.download("https://example.com/f.jpg", dest, "f.jpg")
 
         assert dest.exists()
         assert result.exists()
 
-    @patch("sdk.webscraping.openverse.requests.get")
-    def test_download_default_jpg_extension(self, mock_get, tmp_path):
-        mock_resp = MagicMock()
-        mock_resp.iter_content.return_value = [b"data"]
-        mock_resp.raise_for_status = MagicMock()
-        mock_get.return_value = mock_resp
+    def test_download_default_jpg_extension(self, mock_download, fast_tmp, client):
+        mock_download(_CHUNKS_SMALL)
 
-        client = OpenverseClient()
         result = client.download(
             "https://example.com/unknown_format",
-            tmp_path,
+            fast_tmp,
         )
 
         assert result.suffix == ".jpg"
 
+    def test_download_extension_ignores_query_string(self, mock_download,
+                                                     fast_tmp, client):
+        mock_download(_CHUNKS_SMALL)
+
+        result = client.download(
+            "https://example.com/rain.OGG?fallback=.mp3",
+            fast_tmp,
+        )
+
+        assert result.suffix == ".ogg"
+
+
+# ── Cache keys ─────────────────────────────────────────────────────────
+
+class TestCacheKey:
+    def test_param_order_does_not_matter(self):
+        assert (_cache_key("img", query="q", count=5)
+                == _cache_key("img", count=5, query="q"))
+
+    def test_kind_and_values_are_distinguished(self):
+        keys = {
+            _cache_key("img", query="q", count=5),
+            _cache_key("aud", query="q", count=5),
+            _cache_key("img", query="q", count=6),
+        }
+        assert len(keys) == 3
+        assert all(len(k) == 16 for k in keys)
+
 
 # ── OpenverseClient status ────────────────────────────────────────────
 
 class TestOpenverseClientStatus:
-    def test_status_anonymous(self):
-        client = OpenverseClient()
+    def test_status_anonymous(self, client):
         status = client.get_status()
         assert status["source"] == "openverse"
         assert status["authenticated"] is False
 
-    def test_status_authenticated(self):
-        client = OpenverseClient()
+    def test_status_authenticated(self, client):
         client._token = "some_token"
         status = client.get_status()
         assert status["authenticated"] is True
+
+    def test_close_closes_session(self, monkeypatch, fast_tmp):
+        mock_close = MagicMock()
+        monkeypatch.setattr(requests.Session, "close", mock_close)
+        OpenverseClient(repo_root=fast_tmp).close()
+        mock_close.assert_called_once()
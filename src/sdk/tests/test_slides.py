@@ -1,8 +1,12 @@
 """Tests for sdk.core.slides — new models: styles, animations, templates."""
 
-import json
+from operator import attrgetter
+
 import pytest
+from pydantic import TypeAdapter
 
+# sdk.core.slides resolves names lazily, but importing all of them here
+# loads every slides submodule; this file exercises the whole package.
 from sdk.core.slides import (
     Slide,
     SlideCollection,
@@ -19,17 +23,95 @@ from sdk.core.slides import (
     TemplateLibrary,
 )
 
+TRANSITION_TYPES = (
+    "cut", "cross_dissolve", "gamma_cross", "wipe_single",
+    "wipe_double", "wipe_iris", "wipe_clock",
+)
+
+# Built once; tests derive variants with model_copy(update=...) rather than
+# re-running validation. Never mutate these in place.
+_DEFAULT_STYLE = SlideStyleProps()
+
+# (attribute path, expected default) tables; extend these when fields land.
+_STYLE_NEW_FIELD_DEFAULTS = [
+    ("use_bold", False),
+    ("use_italic", False),
+    ("wrap_width", None),
+    ("shadow", None),
+    ("outline", None),
+    ("box", None),
+    ("title_position", None),
+    ("body_position", None),
+]
+_ANIMATION_DEFAULTS = [
+    ("target", "title"),
+    ("property", "opacity"),
+    ("keyframes", []),
+    ("preset", None),
+    ("preset_duration", 0.5),
+]
+_SLIDE_NEW_FIELD_DEFAULTS = [
+    ("template_id", None),
+    ("animations", []),
+    ("transition.type", "cut"),
+    ("effects", []),
+]
+
+_SLIDE_ADAPTER = TypeAdapter(Slide)
+_STYLE_ADAPTER = TypeAdapter(SlideStyleProps)
+
+# Payloads as written before the style/animation fields existed.
+_OLD_STYLE_JSON = """{
+    "font_family": "Arial",
+    "font_size_title": 80,
+    "font_size_body": 40,
+    "font_color": "#000000",
+    "background_color": "#FFFFFF",
+    "text_alignment": "left",
+    "padding": 50
+}"""
+_OLD_SLIDE_JSON = """{
+    "id": "abc12345",
+    "order": 0,
+    "start_time": 0.0,
+    "end_time": 5.0,
+    "title": "Test",
+    "body_text": "Body",
+    "speaker_notes": "",
+    "background_image_ref": null,
+    "style_overrides": null
+}"""
+
+
+@pytest.fixture(scope="module")
+def default_animation():
+    """One TextAnimation() shared by the default-value table. Do not mutate."""
+    return TextAnimation()
+
+
+@pytest.fixture(scope="module")
+def default_slide():
+    """One Slide() shared by the default-value table. Do not mutate."""
+    return Slide()
+
+
+@pytest.fixture(scope="module")
+def template_library_json() -> str:
+    """A two-template library, serialized once per module."""
+    lib = TemplateLibrary()
+    lib.add(FrameTemplate(id="t1", name="T1", style=SlideStyleProps()))
+    lib.add(FrameTemplate(id="t2", name="T2"))
+    return lib.model_dump_json()
+
 
 # ── TextShadow ────────────────────────────────────────────────────────
 
 class TestTextShadow:
     def test_defaults(self):
         s = TextShadow()
-        assert s.enabled is False
-        assert s.color == "#000000"
-        assert s.offset_x == 2.0
-        assert s.offset_y == -2.0
-        assert s.blur == 0.0
+        assert (s.enabled, s.color, s.offset_x, s.offset_y, s.blur) == (
+            False, "#000000", 2.0, -2.0, 0.0
+        )
 
     def test_custom(self):
         s = TextShadow(enabled=True, color="#FF0000", blur=3.0)
@@ -49,9 +131,7 @@ class TestTextShadow:
 class TestTextOutline:
     def test_defaults(self):
         o = TextOutline()
-        assert o.enabled is False
-        assert o.color == "#000000"
-        assert o.width == 1.0
+        assert (o.enabled, o.color, o.width) == (False, "#000000", 1.0)
 
     def test_custom(self):
         o = TextOutline(enabled=True, width=3.5)
@@ -68,8 +148,7 @@ class TestTextOutline:
 class TestTextBox:
     def test_defaults(self):
         b = TextBox()
-        assert b.enabled is False
-        assert b.margin == 10.0
+        assert (b.enabled, b.margin) == (False, 10.0)
 
     def test_custom(self):
         b = TextBox(enabled=True, color="#333333", margin=20.0)
@@ -87,10 +166,7 @@ class TestTextBox:
 class TestTextPosition:
     def test_defaults(self):
         p = TextPosition()
-        assert p.x == 0.5
-        assert p.y == 0.5
-        assert p.align_x == "CENTER"
-        assert p.align_y == "CENTER"
+        assert (p.x, p.y, p.align_x, p.align_y) == (0.5, 0.5, "CENTER", "CENTER")
 
     def test_custom(self):
         p = TextPosition(x=0.1, y=0.9, align_x="LEFT", align_y="TOP")
@@ -107,38 +183,19 @@ class TestTextPosition:
 
 class TestExpandedSlideStyleProps:
     def test_original_defaults_unchanged(self):
-        s = SlideStyleProps()
-        assert s.font_family == "Bfont"
-        assert s.font_size_title == 72
-        assert s.font_size_body == 36
-        assert s.font_color == "#FFFFFF"
-        assert s.background_color == "#1A1A2E"
-        assert s.text_alignment == "center"
-        assert s.padding == 40
-
-    def test_new_fields_default_to_none_or_false(self):
-        s = SlideStyleProps()
-        assert s.use_bold is False
-        assert s.use_italic is False
-        assert s.wrap_width is None
-        assert s.shadow is None
-        assert s.outline is None
-        assert s.box is None
-        assert s.title_position is None
-        assert s.body_position is None
+        s = _DEFAULT_STYLE
+        assert (
+            s.font_family, s.font_size_title, s.font_size_body, s.font_color,
+            s.background_color, s.text_alignment, s.padding,
+        ) == ("Bfont", 72, 36, "#FFFFFF", "#1A1A2E", "center", 40)
+
+    @pytest.mark.parametrize("attr, expected", _STYLE_NEW_FIELD_DEFAULTS)
+    def test_new_field_default(self, attr, expected):
+        assert attrgetter(attr)(_DEFAULT_STYLE) == expected
 
     def test_old_json_still_deserializes(self):
         """JSON from the original 7-field SlideStyleProps must still load."""
-        old_json = json.dumps({
-            "font_family": "Arial",
-            "font_size_title": 80,
-            "font_size_body": 40,
-            "font_color": "#000000",
-            "background_color": "#FFFFFF",
-            "text_alignment": "left",
-            "padding": 50,
-        })
-        s = SlideStyleProps.model_validate_json(old_json)
+        s = _STYLE_ADAPTER.validate_json(_OLD_STYLE_JSON)
         assert s.font_family == "Arial"
         assert s.shadow is None  # new field absent in old JSON
 
@@ -153,8 +210,7 @@ class TestExpandedSlideStyleProps:
             title_position=TextPosition(x=0.1, y=0.9),
             body_position=TextPosition(x=0.1, y=0.5),
         )
-        data = json.loads(s.model_dump_json())
-        restored = SlideStyleProps(**data)
+        restored = SlideStyleProps.model_validate(s.model_dump())
         assert restored.use_bold is True
         assert restored.shadow.enabled is True
         assert restored.outline.width == 2.0
@@ -164,13 +220,9 @@ class TestExpandedSlideStyleProps:
 # ── TextAnimation ─────────────────────────────────────────────────────
 
 class TestTextAnimation:
-    def test_defaults(self):
-        a = TextAnimation()
-        assert a.target == "title"
-        assert a.property == "opacity"
-        assert a.keyframes == []
-        assert a.preset is None
-        assert a.preset_duration == 0.5
+    @pytest.mark.parametrize("attr, expected", _ANIMATION_DEFAULTS)
+    def test_default(self, attr, expected, default_animation):
+        assert attrgetter(attr)(default_animation) == expected
 
     def test_custom_keyframes(self):
         kf = [Keyframe(time_offset=0.0, value=0.0), Keyframe(time_offset=1.0, value=1.0)]
@@ -190,7 +242,7 @@ class TestTextAnimation:
             property="x",
             keyframes=[Keyframe(time_offset=0.0, value=100.0)],
         )
-        restored = TextAnimation(**json.loads(a.model_dump_json()))
+        restored = TextAnimation.model_validate(a.model_dump())
         assert restored.keyframes[0].value == 100.0
 
 
@@ -207,12 +259,11 @@ class TestSlideTransition:
         assert t.type == "cross_dissolve"
         assert t.duration == 1.5
 
-    def test_all_types_serialize(self):
-        for ttype in ["cut", "cross_dissolve", "gamma_cross", "wipe_single",
-                       "wipe_double", "wipe_iris", "wipe_clock"]:
-            t = SlideTransition(type=ttype, duration=0.5)
-            restored = SlideTransition(**json.loads(t.model_dump_json()))
-            assert restored.type == ttype
+    @pytest.mark.parametrize("ttype", TRANSITION_TYPES)
+    def test_type_serializes(self, ttype):
+        t = SlideTransition(type=ttype, duration=0.5)
+        restored = SlideTransition.model_validate(t.model_dump())
+        assert restored.type == ttype
 
 
 # ── SlideEffect ───────────────────────────────────────────────────────
@@ -243,34 +294,20 @@ class TestSlideEffect:
 
     def test_serialization_roundtrip(self):
         e = SlideEffect(type="transform", translate_x=10.0, translate_y=20.0)
-        restored = SlideEffect(**json.loads(e.model_dump_json()))
+        restored = SlideEffect.model_validate(e.model_dump())
         assert restored.translate_x == 10.0
 
 
 # ── Expanded Slide ────────────────────────────────────────────────────
 
 class TestExpandedSlide:
-    def test_new_fields_default(self):
-        s = Slide()
-        assert s.template_id is None
-        assert s.animations == []
-        assert s.transition.type == "cut"
-        assert s.effects == []
+    @pytest.mark.parametrize("attr, expected", _SLIDE_NEW_FIELD_DEFAULTS)
+    def test_new_field_default(self, attr, expected, default_slide):
+        assert attrgetter(attr)(default_slide) == expected
 
     def test_old_json_still_deserializes(self):
         """JSON from the original Slide (no new fields) must still load."""
-        old_json = json.dumps({
-            "id": "abc12345",
-            "order": 0,
-            "start_time": 0.0,
-            "end_time": 5.0,
-            "title": "Test",
-            "body_text": "Body",
-            "speaker_notes": "",
-            "background_image_ref": None,
-            "style_overrides": None,
-        })
-        s = Slide.model_validate_json(old_json)
+        s = _SLIDE_ADAPTER.validate_json(_OLD_SLIDE_JSON)
         assert s.title == "Test"
         assert s.animations == []
 
@@ -320,7 +357,7 @@ class TestFrameTemplate:
             style=SlideStyleProps(use_italic=True),
             show_body=False,
         )
-        restored = FrameTemplate(**json.loads(t.model_dump_json()))
+        restored = FrameTemplate.model_validate(t.model_dump())
         assert restored.id == "quote"
         assert restored.style.use_italic is True
         assert restored.show_body is False
@@ -366,44 +403,56 @@ class TestTemplateLibrary:
             assert "name" in entry
             assert "has_style" in entry
 
-    def test_serialization_roundtrip(self):
-        lib = TemplateLibrary()
-        lib.add(FrameTemplate(id="t1", name="T1", style=SlideStyleProps()))
-        lib.add(FrameTemplate(id="t2", name="T2"))
-        restored = TemplateLibrary(**json.loads(lib.model_dump_json()))
+    def test_json_roundtrip(self, template_library_json):
+        """End-to-end JSON path; the other roundtrip tests stay in dict mode."""
+        restored = TemplateLibrary.model_validate_json(template_library_json)
         assert len(restored.templates) == 2
         assert restored.get("t1").style is not None
 
+    def test_json_is_stable(self, template_library_json):
+        restored = TemplateLibrary.model_validate_json(template_library_json)
+        assert restored.model_dump_json() == template_library_json
+
 
 # ── Style Resolution Order ────────────────────────────────────────────
 
+@pytest.fixture(scope="module")
+def style_layers() -> dict[str, dict]:
+    """model_dump() of each style layer, computed once per module."""
+    global_style = _DEFAULT_STYLE.model_copy(
+        update={"font_color": "#AAAAAA", "font_size_title": 50, "padding": 100},
+    )
+    template = FrameTemplate(
+        id="tmpl",
+        name="Template",
+        style=_DEFAULT_STYLE.model_copy(
+            update={"font_color": "#BBBBBB", "font_size_body": 28},
+        ),
+    )
+    slide = Slide(
+        style_overrides=_DEFAULT_STYLE.model_copy(update={"font_color": "#CCCCCC"}),
+    )
+    return {
+        "global": global_style.model_dump(),
+        "template": template.style.model_dump(),
+        "slide": slide.style_overrides.model_dump(),
+    }
+
+
 class TestStyleResolution:
     """Verify the intended style resolution: slide > template > global."""
 
-    def test_slide_overrides_template_overrides_global(self):
+    def test_slide_overrides_template_overrides_global(self, style_layers):
         """Style resolution: slide > template > global.
 
         With Pydantic model_dump(), all fields (including defaults) are emitted,
         so each layer fully overwrites the previous. The priority order is:
         slide.style_overrides > template.style > collection.global_style.
         """
-        global_style = SlideStyleProps(font_color="#AAAAAA", font_size_title=50)
-        template = FrameTemplate(
-            id="tmpl",
-            name="Template",
-            style=SlideStyleProps(font_color="#BBBBBB", font_size_body=28),
-        )
-        slide = Slide(
-            style_overrides=SlideStyleProps(font_color="#CCCCCC"),
-        )
-
         # Resolution: each layer fully overwrites; last layer wins
-        resolved = global_style.model_dump()
-        if template.style:
-            resolved.update(template.style.model_dump())
-        if slide.style_overrides:
-            resolved.update(slide.style_overrides.model_dump())
-        final = SlideStyleProps(**resolved)
+        final = _STYLE_ADAPTER.validate_python(
+            {**style_layers["global"], **style_layers["template"], **style_layers["slide"]}
+        )
 
         # slide override wins for font_color (it set #CCCCCC)
         assert final.font_color == "#CCCCCC"
@@ -412,26 +461,17 @@ class TestStyleResolution:
         # slide's default font_size_title (72) overwrites global's 50
         assert final.font_size_title == 72
 
-    def test_resolution_with_only_template(self):
+    def test_resolution_with_only_template(self, style_layers):
         """When no slide overrides, template wins over global."""
-        global_style = SlideStyleProps(font_color="#AAAAAA")
-        template = FrameTemplate(
-            id="tmpl",
-            name="Template",
-            style=SlideStyleProps(font_color="#BBBBBB"),
+        final = _STYLE_ADAPTER.validate_python(
+            {**style_layers["global"], **style_layers["template"]}
         )
 
-        resolved = global_style.model_dump()
-        if template.style:
-            resolved.update(template.style.model_dump())
-        final = SlideStyleProps(**resolved)
-
         assert final.font_color == "#BBBBBB"
 
-    def test_resolution_global_only(self):
+    def test_resolution_global_only(self, style_layers):
         """When no template or slide overrides, global style is used as-is."""
-        global_style = SlideStyleProps(font_color="#AAAAAA", padding=100)
-        final = SlideStyleProps(**global_style.model_dump())
+        final = _STYLE_ADAPTER.validate_python(style_layers["global"])
         assert final.font_color == "#AAAAAA"
         assert final.padding == 100
 
@@ -448,3 +488,15 @@ class TestBackwardCompatShim:
         assert FrameSlide is Slide
         assert FrameCollection is SlideCollection
         assert FrameStyle is SlideStyleProps
+
+
+# ── Lazy package exports ─────────────────────────────────────────────
+
+class TestPackageExports:
+    @pytest.mark.parametrize("package", ["sdk.core", "sdk.core.slides"])
+    def test_star_import_exports_every_name(self, package):
+        namespace: dict = {}
+        exec(f"from {package} import *", namespace)
+        module = __import__(package, fromlist=["_EXPORTS"])
+        assert set(module._EXPORTS) <= set(namespace)
+        assert set(module._EXPORTS) <= set(dir(module))
@@ -138,6 +138,39 @@ class TestUndo:
             state.checkpoint(f"step {i}")
         assert len(state.undo_stack) == 50
 
+    def test_undo_stack_limit_survives_validation(self):
+        entries = [UndoEntry(description=f"step {i}", collection_json=b"{}")
+                   for i in range(60)]
+        state = SessionState(undo_stack=entries)
+        assert state.undo_stack.maxlen == 50
+        assert len(state.undo_stack) == 50
+        assert state.undo_stack[0].description == "step 10"
+
+        restored = SessionState.model_validate({"undo_stack": []})
+        assert restored.undo_stack.maxlen == 50
+
+    def test_checkpoint_shares_unchanged_slides(self):
+        state = self._state_with_slides(3)
+        state.checkpoint("first")
+        state.slides.slides[1].title = "Edited"
+        state.checkpoint("second")
+        first, second = state.undo_stack
+        assert first.slide_jsons[0] is second.slide_jsons[0]
+        assert first.slide_jsons[2] is second.slide_jsons[2]
+        assert first.slide_jsons[1] != second.slide_jsons[1]
+        assert first.collection_json is second.collection_json
+
+    def test_undo_restores_every_collection_field(self):
+        state = self._state_with_slides(2)
+        before = state.slides.model_dump()
+        state.checkpoint("snapshot")
+
+        state.slides.global_style.font_size_title = 99
+        state.slides.slides[0].title = "Changed"
+
+        state.undo()
+        assert state.slides.model_dump() == before
+
     def test_undo_preserves_slide_data(self):
         state = SessionState()
         state.slides.add(Slide(
@@ -184,6 +217,23 @@ class TestAutoSave:
         assert len(data["slides"]) == 1
         assert data["slides"][0]["title"] == "Slide A"
 
+    def test_auto_save_skips_unchanged_state(self, tmp_path):
+        ws = Workspace(project_name="test", root_path=tmp_path / "proj")
+        ws.initialize()
+
+        state = SessionState(workspace=ws)
+        state.slides.add(Slide(title="Slide A"))
+        state.auto_save()
+        slides_path = ws.root_path / "slides.json"
+        first_write = slides_path.stat().st_ino  # os.replace swaps the inode
+
+        state.auto_save()
+        assert slides_path.stat().st_ino == first_write
+
+        state.slides.slides[0].title = "Slide B"
+        state.auto_save()
+        assert json.loads(slides_path.read_text())["slides"][0]["title"] == "Slide B"
+
     def test_load_slides_from_workspace(self, tmp_path):
         ws = Workspace(project_name="test", root_path=tmp_path / "proj")
         ws.initialize()
@@ -0,0 +1,110 @@
+"""Tests for sdk.webscraping.video — download_video license filter, rate limiting."""
+
+import sys
+import types
+import pytest
+from unittest.mock import MagicMock
+
+from sdk.webscraping import video
+
+
+@pytest.fixture
+def ydl(monkeypatch):
+    """Stand-in yt_dlp module; returns the YoutubeDL instance to configure."""
+    instance = MagicMock()
+    instance.__enter__.return_value = instance
+    module = types.ModuleType("yt_dlp")
+    module.YoutubeDL = MagicMock(return_value=instance)
+    monkeypatch.setitem(sys.modules, "yt_dlp", module)
+    return instance
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """Fresh single-slot limiter so each test starts with one download left."""
+    fresh = video.RateLimiter(1, 3600)
+    monkeypatch.setattr(video, "_rate_limiter", fresh)
+    return fresh
+
+
+class TestCcMatchFilter:
+    def test_admits_creative_commons(self):
+        assert video._cc_match_filter({"license": "Creative Commons Attribution"}) is None
+
+    def test_rejects_standard_license(self):
+        assert video._cc_match_filter({"license": "Standard YouTube License"})
+
+    def test_defers_until_license_is_known(self):
+        assert video._cc_match_filter({}, incomplete=True) is None
+        assert video._cc_match_filter({})
+
+    def test_rejects_known_license_early(self):
+        info = {"license": "Standard YouTube License"}
+        assert video._cc_match_filter(info, incomplete=True)
+
+
+class TestDownloadVideo:
+    def test_non_cc_video_raises(self, ydl, limiter, tmp_path):
+        # yt-dlp fills requested_downloads before the filter skips the video
+        ydl.extract_info.return_value = {
+            "license": "Standard YouTube License",
+            "requested_downloads": [{"ext": "mp4"}],
+        }
+
+        with pytest.raises(ValueError, match="not Creative Commons"):
+            video.download_video("https://example.com/v", tmp_path)
+
+        opts = sys.modules["yt_dlp"].YoutubeDL.call_args.args[0]
+        assert opts["match_filter"] is video._cc_match_filter
+
+    def test_cc_only_false_skips_filter(self, ydl, limiter, tmp_path):
+        ydl.extract_info.return_value = {
+            "license": "Standard YouTube License",
+            "requested_downloads": [{"filepath": str(tmp_path / "v.mp4")}],
+        }
+
+        result = video.download_video("https://example.com/v", tmp_path, cc_only=False)
+
+        assert result == tmp_path / "v.mp4"
+        opts = sys.modules["yt_dlp"].YoutubeDL.call_args.args[0]
+        assert "match_filter" not in opts
+
+    def test_missing_filepath_raises(self, ydl, limiter, tmp_path):
+        ydl.extract_info.return_value = {
+            "license": "Creative Commons Attribution",
+            "requested_downloads": [{"ext": "mp4"}],
+        }
+
+        with pytest.raises(RuntimeError, match="did not report"):
+            video.download_video("https://example.com/v", tmp_path)
+
+
+class TestDownloadVideoRateLimit:
+    def test_rejected_video_returns_token(self, ydl, limiter, tmp_path):
+        ydl.extract_info.return_value = {"license": "Standard YouTube License"}
+
+        with pytest.raises(ValueError):
+            video.download_video("https://example.com/v", tmp_path)
+
+        assert limiter.tokens == 1
+
+    def test_failed_download_returns_token(self, ydl, limiter, tmp_path):
+        ydl.extract_info.side_effect = ConnectionError("offline")
+
+        with pytest.raises(ConnectionError):
+            video.download_video("https://example.com/v", tmp_path)
+
+        assert limiter.tokens == 1
+
+    def test_successful_download_uses_token(self, ydl, limiter, tmp_path):
+        ydl.extract_info.return_value = {
+            "license": "Creative Commons Attribution license (reuse allowed)",
+            "requested_downloads": [{"filepath": str(tmp_path / "v.mp4")}],
+        }
+
+        result = video.download_video("https://example.com/v", tmp_path)
+
+        assert result == tmp_path / "v.mp4"
+        assert limiter.tokens == 0
+        with pytest.raises(RuntimeError, match="Rate limit"):
+            video.download_video("https://example.com/v", tmp_path)
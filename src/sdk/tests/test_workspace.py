@@ -1,6 +1,9 @@
 """Tests for sdk.core.workspace — Workspace, AssetMetadata."""
 
 import json
+import os
+import stat
+import sys
 import pytest
 from pathlib import Path
 
@@ -118,6 +121,22 @@ class TestWorkspaceManifest:
         loaded = Workspace.load(workspace.root_path)
         assert len(loaded.assets) == 2
 
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+    def test_manifest_mode_follows_umask(self, workspace_dir):
+        old = os.umask(0o022)
+        try:
+            ws = Workspace(project_name="test_project", root_path=workspace_dir)
+            ws.initialize()
+        finally:
+            os.umask(old)
+        assert stat.S_IMODE(ws.manifest_path.stat().st_mode) == 0o644
+
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX permission bits")
+    def test_save_keeps_existing_mode(self, workspace):
+        workspace.manifest_path.chmod(0o640)
+        workspace.save_manifest()
+        assert stat.S_IMODE(workspace.manifest_path.stat().st_mode) == 0o640
+
 
 # ── Asset registration ─────────────────────────────────────────────────
 
@@ -137,6 +156,30 @@ class TestWorkspaceAssets:
         data = json.loads(workspace.manifest_path.read_text())
         assert "aud_001" in data["assets"]
 
+    def test_manifest_write_leaves_no_temp_files(self, workspace):
+        workspace.register_asset(AssetMetadata(
+            asset_id="img_001", filename="bg.jpg", type="image",
+        ))
+        assert not list(workspace.root_path.glob("*.tmp"))
+
+    def test_register_without_flush_defers_write(self, workspace):
+        workspace.register_asset(AssetMetadata(
+            asset_id="img_001", filename="bg.jpg", type="image",
+        ), flush=False)
+        assert json.loads(workspace.manifest_path.read_text())["assets"] == {}
+        workspace.flush()
+        assert "img_001" in json.loads(workspace.manifest_path.read_text())["assets"]
+
+    def test_batch_writes_manifest_once_on_exit(self, workspace):
+        with workspace.batch():
+            for i in range(3):
+                workspace.register_asset(AssetMetadata(
+                    asset_id=f"img_{i}", filename=f"{i}.jpg", type="image",
+                ))
+            assert json.loads(workspace.manifest_path.read_text())["assets"] == {}
+        data = json.loads(workspace.manifest_path.read_text())
+        assert set(data["assets"]) == {"img_0", "img_1", "img_2"}
+
     def test_register_overwrites_same_id(self, workspace):
         workspace.register_asset(AssetMetadata(
             asset_id="x", filename="old.jpg", type="image",
@@ -153,6 +196,20 @@ class TestWorkspaceAssets:
         path = workspace.get_asset_path("img_001")
         assert path == workspace.images_dir / "bg.jpg"
 
+    def test_get_asset_path_follows_root_path(self, workspace, tmp_path):
+        workspace.register_asset(AssetMetadata(
+            asset_id="img_001", filename="bg.jpg", type="image",
+        ))
+        workspace.get_asset_path("img_001")
+
+        moved = tmp_path / "moved"
+        copy = workspace.model_copy(update={"root_path": moved})
+        assert copy.get_asset_path("img_001") == moved / "assets" / "images" / "bg.jpg"
+        assert copy.manifest_path == moved / "project.json"
+
+        workspace.root_path = moved
+        assert workspace.get_asset_path("img_001") == moved / "assets" / "images" / "bg.jpg"
+
     def test_get_asset_path_audio(self, workspace):
         workspace.register_asset(AssetMetadata(
             asset_id="aud_001", filename="voice.mp3", type="audio",
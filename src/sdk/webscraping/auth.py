@@ -3,11 +3,11 @@
 import json
 import logging
 import time
-from dataclasses import asdict, dataclass, field
+from dataclasses import asdict, dataclass, field, fields
 from pathlib import Path
 from typing import Optional
 
-import requests
+from ..fileio import atomic_write_bytes
 
 logger = logging.getLogger("VideoDraftMCP.webscraping.auth")
 
@@ -16,7 +16,7 @@ CREDENTIALS_DIR = ".credentials"
 CREDENTIALS_FILE = "openverse.json"
 
 
-@dataclass
+@dataclass(slots=True)
 class OpenverseCredentials:
     """Stored credentials for the Openverse API."""
     client_id: str = ""
@@ -37,11 +37,14 @@ class OpenverseCredentials:
 
     @classmethod
     def from_dict(cls, data: dict) -> "OpenverseCredentials":
-        known_fields = {f.name for f in cls.__dataclass_fields__.values()}
-        filtered = {k: v for k, v in data.items() if k in known_fields}
+        filtered = {k: v for k, v in data.items() if k in _CREDENTIAL_FIELDS}
         return cls(**filtered)
 
 
+# Field names accepted by OpenverseCredentials.from_dict, computed once
+_CREDENTIAL_FIELDS = frozenset(f.name for f in fields(OpenverseCredentials))
+
+
 class OpenverseAuth:
     """Handles Openverse API registration, token exchange, and credential persistence."""
 
@@ -56,7 +59,7 @@ class OpenverseAuth:
         if not self._creds_path.exists():
             return None
         try:
-            data = json.loads(self._creds_path.read_text())
+            data = json.loads(self._creds_path.read_bytes())
             self._credentials = OpenverseCredentials.from_dict(data)
             return self._credentials
         except (json.JSONDecodeError, TypeError, KeyError) as e:
@@ -68,11 +71,15 @@ class OpenverseAuth:
         if self._credentials is None:
             return
         self._creds_path.parent.mkdir(parents=True, exist_ok=True)
-        self._creds_path.write_text(json.dumps(self._credentials.to_dict(), indent=2))
+        atomic_write_bytes(
+            self._creds_path,
+            json.dumps(self._credentials.to_dict(), separators=(",", ":")).encode(),
+        )
 
     def register(self, name: str, description: str, email: str) -> OpenverseCredentials:
         """Register a new application with the Openverse API."""
-        resp = requests.post(
+        from .http import SESSION
+        resp = SESSION.post(
             f"{BASE_URL}/v1/auth_tokens/register/",
             json={
                 "name": name,
@@ -101,7 +108,8 @@ class OpenverseAuth:
         if self._credentials.is_token_valid():
             return self._credentials.access_token
 
-        resp = requests.post(
+        from .http import SESSION
+        resp = SESSION.post(
             f"{BASE_URL}/v1/auth_tokens/token/",
             data={
                 "grant_type": "client_credentials",
@@ -0,0 +1,53 @@
+"""Shared HTTP plumbing for the webscraping clients.
+
+SESSION is built on first access (PEP 562), so importing the webscraping
+modules does not pull in requests and urllib3 until a request is made.
+"""
+
+import threading
+from typing import TYPE_CHECKING, Union
+
+if TYPE_CHECKING:
+    import requests
+    from urllib3.util.retry import Retry
+
+    SESSION: requests.Session
+
+# Buffer size for streaming downloads to disk
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
+# Media is already compressed; ask servers not to gzip it again in transit
+DOWNLOAD_HEADERS = {"Accept-Encoding": "identity"}
+
+_lock = threading.Lock()
+
+
+def make_session(max_retries: Union[int, "Retry"] = 0) -> "requests.Session":
+    """Build a keep-alive session; max_retries is passed to the HTTPAdapter."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    # One keep-alive pool for every API and CDN host we talk to, so repeated
+    # searches and downloads reuse connections instead of redoing TLS
+    # handshakes.
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=32,
+                          max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def head(results: list, count: int) -> list:
+    """First count results, reusing the list itself when it is short enough."""
+    return results if count >= len(results) else results[:count]
+
+
+def __getattr__(name: str):
+    if name != "SESSION":
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # Image searches hit this from worker threads; build the session once.
+    with _lock:
+        if "SESSION" not in globals():
+            globals()["SESSION"] = make_session()
+    return globals()["SESSION"]
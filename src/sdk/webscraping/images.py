@@ -3,41 +3,76 @@
 import hashlib
 import logging
 import os
+import secrets
+import shutil
+import threading
 import time
-import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
+from urllib.parse import urlparse
 
-import requests
+from .http import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_HEADERS, head
 
 logger = logging.getLogger("VideoDraftMCP.webscraping.images")
 
+# URL path suffixes kept as-is for auto-named downloads; anything else is .jpg
+_IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png", ".webp"})
+
 
 class RateLimiter:
-    """Simple token-bucket rate limiter per source."""
+    """Thread-safe token-bucket rate limiter per source."""
 
     def __init__(self, max_requests: int, period_seconds: float):
         self.max_requests = max_requests
-        self.period = period_seconds
+        self.period_ns = int(period_seconds * 1e9)
         self.tokens = max_requests
-        self.last_refill = time.time()
-
-    def acquire(self) -> bool:
-        now = time.time()
-        elapsed = now - self.last_refill
-        refill = int(elapsed / self.period * self.max_requests)
-        if refill > 0:
-            self.tokens = min(self.max_requests, self.tokens + refill)
-            self.last_refill = now
-
-        if self.tokens > 0:
+        self.last_refill_ns = time.monotonic_ns()
+        self._lock = threading.Lock()
+
+    @property
+    def refill_interval(self) -> float:
+        """Seconds it takes for one token to refill."""
+        return self.period_ns / self.max_requests / 1e9
+
+    def acquire(self, max_wait: float = 0.0) -> bool:
+        """Take a token, sleeping up to max_wait seconds for one to refill.
+
+        A caller that has to wait reserves its token before sleeping (tokens
+        goes negative), so concurrent callers queue up behind it in order.
+        """
+        with self._lock:
+            now = time.monotonic_ns()
+            elapsed = now - self.last_refill_ns
+            refill = elapsed * self.max_requests // self.period_ns
+            if refill > 0:
+                self.tokens = min(self.max_requests, self.tokens + refill)
+                # Advance only by the time the whole tokens account for, so
+                # the fractional remainder carries over to the next acquire().
+                self.last_refill_ns += refill * self.period_ns // self.max_requests
+
+            if self.tokens > 0:
+                self.tokens -= 1
+                return True
+
+            # Time until enough refills to cover any reserved debt plus ours
+            wait_ns = ((1 - self.tokens) * self.period_ns // self.max_requests
+                       - (now - self.last_refill_ns))
+            if wait_ns > max_wait * 1e9:
+                return False
             self.tokens -= 1
-            return True
-        return False
+        time.sleep(wait_ns / 1e9)
+        return True
 
+    def release(self) -> None:
+        """Give back a token taken by acquire() for work that did not happen."""
+        with self._lock:
+            self.tokens = min(self.max_requests, self.tokens + 1)
 
-@dataclass
+
+@dataclass(slots=True)
 class ImageResult:
     """A search result from any image source."""
     id: str
@@ -51,7 +86,7 @@ class ImageResult:
     license: str = "free"
 
 
-@dataclass
+@dataclass(slots=True)
 class _CacheEntry:
     results: list[ImageResult]
     timestamp: float
@@ -61,6 +96,8 @@ class ImageSearcher:
     """Multi-source free image search with rate limiting and caching."""
 
     CACHE_TTL = 900  # 15 minutes
+    CACHE_MAX = 256  # least recently used entries are evicted beyond this
+    SEARCH_TIMEOUT = 30  # seconds to wait on each source's future
 
     def __init__(self, openverse_client=None):
         self._rate_limiters: dict[str, RateLimiter] = {
@@ -68,8 +105,13 @@ class ImageSearcher:
             "pexels": RateLimiter(200, 3600),     # 200/hour
             "pixabay": RateLimiter(100, 60),      # 100/minute
         }
-        self._cache: dict[str, _CacheEntry] = {}
+        self._cache: OrderedDict[str, _CacheEntry] = OrderedDict()
         self._openverse_client = openverse_client
+        # Sources are queried concurrently; the requests release the GIL
+        # while waiting on the network.
+        self._pool = ThreadPoolExecutor(
+            max_workers=3, thread_name_prefix="image-search",
+        )
 
     @staticmethod
     def _get_api_key(source: str) -> Optional[str]:
@@ -88,7 +130,7 @@ class ImageSearcher:
             limiter = self._rate_limiters[source]
             status[source] = {
                 "configured": bool(key),
-                "remaining_requests": limiter.tokens,
+                "remaining_requests": max(0, limiter.tokens),
             }
         if self._openverse_client:
             status["openverse"] = self._openverse_client.get_status()
@@ -97,33 +139,41 @@ class ImageSearcher:
     def search(self, query: str, count: int = 5,
                min_width: int = 1280,
                orientation: str = "landscape") -> list[ImageResult]:
-        """Search multiple sources for images, rotating through available APIs."""
+        """Search multiple sources for images, rotating through available APIs.
+
+        The returned list may be shared with the result cache; treat it as
+        read-only.
+        """
         cache_key = f"{query}:{count}:{orientation}"
         cached = self._cache.get(cache_key)
-        if cached and (time.time() - cached.timestamp) < self.CACHE_TTL:
-            return cached.results[:count]
+        if cached:
+            if (time.monotonic() - cached.timestamp) < self.CACHE_TTL:
+                self._cache.move_to_end(cache_key)
+                return head(cached.results, count)
+            del self._cache[cache_key]
 
         results: list[ImageResult] = []
         per_source = max(1, (count + 2) // 3)
 
-        # Try each source
+        # Query every available source at once
+        pending = []
         for source in ["unsplash", "pexels", "pixabay"]:
-            if len(results) >= count:
-                break
             key = self._get_api_key(source)
             if not key:
                 continue
             if not self._rate_limiters[source].acquire():
                 logger.warning(f"Rate limit reached for {source}")
                 continue
-
+            future = self._pool.submit(
+                self._search_source, source, query, per_source,
+                min_width, orientation, key,
+            )
+            pending.append((source, future))
+
+        # Merge in source order so results stay deterministic
+        for source, future in pending:
             try:
-                if source == "unsplash":
-                    results.extend(self._search_unsplash(query, per_source, orientation, key))
-                elif source == "pexels":
-                    results.extend(self._search_pexels(query, per_source, orientation, key))
-                elif source == "pixabay":
-                    results.extend(self._search_pixabay(query, per_source, min_width, orientation, key))
+                results.extend(future.result(timeout=self.SEARCH_TIMEOUT))
             except Exception as e:
                 logger.error(f"Error searching {source}: {e}")
 
@@ -138,122 +188,131 @@ class ImageSearcher:
             except Exception as e:
                 logger.error(f"Error searching Openverse: {e}")
 
-        self._cache[cache_key] = _CacheEntry(results=results, timestamp=time.time())
-        return results[:count]
+        self._cache[cache_key] = _CacheEntry(results=results, timestamp=time.monotonic())
+        if len(self._cache) > self.CACHE_MAX:
+            self._cache.popitem(last=False)
+        return head(results, count)
 
     def download(self, url: str, dest_dir: Path, filename: Optional[str] = None) -> Path:
         """Download an image to the specified directory."""
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         if not filename:
-            ext = ".jpg"
-            if ".png" in url.lower():
-                ext = ".png"
-            elif ".webp" in url.lower():
-                ext = ".webp"
-            filename = f"{uuid.uuid4().hex[:12]}{ext}"
+            ext = os.path.splitext(urlparse(url).path)[1].lower()
+            if ext not in _IMAGE_EXTENSIONS:
+                ext = ".jpg"
+            filename = f"{secrets.token_hex(6)}{ext}"
 
+        from .http import SESSION
         dest_path = dest_dir / filename
-        response = requests.get(url, timeout=30, stream=True)
+        response = SESSION.get(url, headers=DOWNLOAD_HEADERS,
+                               timeout=30, stream=True)
         response.raise_for_status()
+        response.raw.decode_content = True
 
         with open(dest_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+            shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
 
         logger.info(f"Downloaded image to {dest_path}")
         return dest_path
 
-    # ── Source-specific search methods ──────────────────────────────────
-
-    def _search_unsplash(self, query: str, count: int, orientation: str,
-                         api_key: str) -> list[ImageResult]:
-        resp = requests.get(
-            "https://api.unsplash.com/search/photos",
-            params={
-                "query": query,
-                "per_page": count,
-                "orientation": orientation,
-            },
-            headers={"Authorization": f"Client-ID {api_key}"},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    # ── Source-specific search ──────────────────────────────────────────
 
-        results = []
-        for item in data.get("results", []):
-            results.append(ImageResult(
-                id=item["id"],
-                source="unsplash",
-                preview_url=item["urls"]["small"],
-                full_url=item["urls"]["regular"],
-                download_url=item["urls"]["full"],
-                width=item["width"],
-                height=item["height"],
-                photographer=item.get("user", {}).get("name", ""),
-                license="Unsplash License",
-            ))
-        return results
-
-    def _search_pexels(self, query: str, count: int, orientation: str,
-                       api_key: str) -> list[ImageResult]:
-        resp = requests.get(
-            "https://api.pexels.com/v1/search",
-            params={
-                "query": query,
-                "per_page": count,
-                "orientation": orientation,
-            },
-            headers={"Authorization": api_key},
-            timeout=15,
-        )
-        resp.raise_for_status()
-        data = resp.json()
+    def close(self) -> None:
+        """Shut down the search worker threads."""
+        self._pool.shutdown(wait=True)
 
-        results = []
-        for item in data.get("photos", []):
-            results.append(ImageResult(
-                id=str(item["id"]),
-                source="pexels",
-                preview_url=item["src"]["medium"],
-                full_url=item["src"]["large2x"],
-                download_url=item["src"]["original"],
-                width=item["width"],
-                height=item["height"],
-                photographer=item.get("photographer", ""),
-                license="Pexels License",
-            ))
-        return results
-
-    def _search_pixabay(self, query: str, count: int, min_width: int,
-                        orientation: str, api_key: str) -> list[ImageResult]:
-        resp = requests.get(
-            "https://pixabay.com/api/",
-            params={
-                "key": api_key,
-                "q": query,
-                "per_page": count,
-                "min_width": min_width,
-                "orientation": orientation,
-                "image_type": "photo",
-            },
+    def _search_source(self, source: str, query: str, count: int,
+                       min_width: int, orientation: str,
+                       api_key: str) -> list[ImageResult]:
+        from .http import SESSION
+        spec = _SOURCE_SPECS[source]
+        resp = SESSION.get(
+            spec.endpoint,
+            params=spec.params(query, count, min_width, orientation, api_key),
+            headers=spec.headers(api_key),
             timeout=15,
         )
         resp.raise_for_status()
         data = resp.json()
-
-        results = []
-        for item in data.get("hits", []):
-            results.append(ImageResult(
-                id=str(item["id"]),
-                source="pixabay",
-                preview_url=item["webformatURL"],
-                full_url=item["largeImageURL"],
-                download_url=item["largeImageURL"],
-                width=item["imageWidth"],
-                height=item["imageHeight"],
-                photographer=item.get("user", ""),
-                license="Pixabay License",
-            ))
-        return results
+        return [spec.to_result(item) for item in data.get(spec.results_key, ())]
+
+
+@dataclass(slots=True, frozen=True)
+class _SourceSpec:
+    """How to query one image API and map its items to ImageResult."""
+    endpoint: str
+    headers: Callable[[str], dict]
+    params: Callable[[str, int, int, str, str], dict]
+    results_key: str
+    to_result: Callable[[dict], ImageResult]
+
+
+_SOURCE_SPECS: dict[str, _SourceSpec] = {
+    "unsplash": _SourceSpec(
+        endpoint="https://api.unsplash.com/search/photos",
+        headers=lambda key: {"Authorization": f"Client-ID {key}"},
+        params=lambda query, count, min_width, orientation, key: {
+            "query": query,
+            "per_page": count,
+            "orientation": orientation,
+        },
+        results_key="results",
+        to_result=lambda item: ImageResult(
+            id=item["id"],
+            source="unsplash",
+            preview_url=item["urls"]["small"],
+            full_url=item["urls"]["regular"],
+            download_url=item["urls"]["full"],
+            width=item["width"],
+            height=item["height"],
+            photographer=item.get("user", {}).get("name", ""),
+            license="Unsplash License",
+        ),
+    ),
+    "pexels": _SourceSpec(
+        endpoint="https://api.pexels.com/v1/search",
+        headers=lambda key: {"Authorization": key},
+        params=lambda query, count, min_width, orientation, key: {
+            "query": query,
+            "per_page": count,
+            "orientation": orientation,
+        },
+        results_key="photos",
+        to_result=lambda item: ImageResult(
+            id=str(item["id"]),
+            source="pexels",
+            preview_url=item["src"]["medium"],
+            full_url=item["src"]["large2x"],
+            download_url=item["src"]["original"],
+            width=item["width"],
+            height=item["height"],
+            photographer=item.get("photographer", ""),
+            license="Pexels License",
+        ),
+    ),
+    "pixabay": _SourceSpec(
+        endpoint="https://pixabay.com/api/",
+        headers=lambda key: {},
+        params=lambda query, count, min_width, orientation, key: {
+            "key": key,
+            "q": query,
+            "per_page": count,
+            "min_width": min_width,
+            "orientation": orientation,
+            "image_type": "photo",
+        },
+        results_key="hits",
+        to_result=lambda item: ImageResult(
+            id=str(item["id"]),
+            source="pixabay",
+            preview_url=item["webformatURL"],
+            full_url=item["largeImageURL"],
+            download_url=item["largeImageURL"],
+            width=item["imageWidth"],
+            height=item["imageHeight"],
+            photographer=item.get("user", ""),
+            license="Pixabay License",
+        ),
+    ),
+}
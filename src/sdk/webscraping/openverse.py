@@ -1,21 +1,35 @@
 """Openverse API client for image and audio search."""
 
+import hashlib
+import json
 import logging
+import os
+import secrets
+import shutil
+import threading
 import time
-import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Optional
+from urllib.parse import urlsplit
 
-import requests
+from pydantic_core import from_json
 
 from .auth import OpenverseAuth, BASE_URL
+from .http import DOWNLOAD_CHUNK_SIZE, DOWNLOAD_HEADERS, head, make_session
 from .images import ImageResult, RateLimiter
 
 logger = logging.getLogger("VideoDraftMCP.webscraping.openverse")
 
+# URL path suffixes kept as-is for auto-named downloads; anything else is .jpg
+_MEDIA_EXTENSIONS = frozenset({
+    ".jpg", ".jpeg", ".png", ".webp", ".mp3", ".wav", ".ogg", ".flac",
+})
 
-@dataclass
+
+@dataclass(slots=True)
 class AudioResult:
     """A search result from Openverse audio."""
     id: str
@@ -30,7 +44,42 @@ class AudioResult:
     tags: list[str] = field(default_factory=list)
 
 
-@dataclass
+def _cache_key(kind: str, **params) -> bytes:
+    """Fixed-size digest of a canonical (kind, sorted params) encoding."""
+    canonical = json.dumps((kind, sorted(params.items())), separators=(",", ":"))
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+
+def _preallocate(fd: int, size: int) -> bool:
+    """Reserve size bytes of contiguous disk for fd where the OS supports it."""
+    if not hasattr(os, "posix_fallocate"):
+        return False
+    try:
+        os.posix_fallocate(fd, 0, size)
+    except OSError:  # e.g. filesystems without fallocate support
+        return False
+    return True
+
+
+def _pwrite_stream(raw, fd: int, offset: int, length: int) -> None:
+    """Copy exactly length bytes from raw into fd starting at offset."""
+    end = offset + length
+    while offset < end:
+        chunk = raw.read(min(DOWNLOAD_CHUNK_SIZE, end - offset))
+        if not chunk:
+            raise IOError(f"Download ended {end - offset} bytes short")
+        view = memoryview(chunk)
+        while view:
+            written = os.pwrite(fd, view, offset)
+            offset += written
+            view = view[written:]
+
+
+class _RangeIgnored(IOError):
+    """A server advertised byte ranges but answered a Range request in full."""
+
+
+@dataclass(slots=True)
 class _CacheEntry:
     results: list
     timestamp: float
@@ -40,12 +89,33 @@ class OpenverseClient:
     """Unified client for Openverse image and audio search."""
 
     CACHE_TTL = 900  # 15 minutes
+    NEGATIVE_TTL = 60  # empty result sets are retried sooner
+    CACHE_MAX = 256  # least recently used entries are evicted beyond this
+    CACHE_SWEEP_EVERY = 64  # cache writes between full expiry sweeps
+    # Refill intervals a search may wait for its token before giving up;
+    # enough for every worker of a default-size search_images_batch.
+    RATE_LIMIT_WAIT_TOKENS = 8
+    RANGED_DOWNLOAD_MIN = 4 * 1024 * 1024  # split downloads at least this big
+    RANGED_DOWNLOAD_PARTS = 4
 
     def __init__(self, repo_root: Optional[Path] = None):
         self._auth = OpenverseAuth(repo_root=repo_root)
         self._token: str = ""
         self._rate_limiter = RateLimiter(18, 60)  # 18 req/min conservative
-        self._cache: dict[str, _CacheEntry] = {}
+        self._cache: OrderedDict[bytes, _CacheEntry] = OrderedDict()
+        self._cache_writes = 0
+        # Guards the cache for concurrent searches (e.g. search_images_batch);
+        # never held across network calls.
+        self._cache_lock = threading.RLock()
+        # Own session rather than the shared one, so throttled/unavailable
+        # Openverse responses are retried and close() only affects us.
+        from urllib3.util.retry import Retry
+        self._session = make_session(max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 502, 503, 504),
+            raise_on_status=False,  # let raise_for_status() report the final status
+        ))
 
     def initialize(self, email: Optional[str] = None) -> None:
         """Authenticate with Openverse (or fall back to anonymous access)."""
@@ -56,15 +126,53 @@ class OpenverseClient:
             return {"Authorization": f"Bearer {self._token}"}
         return {}
 
+    def _rate_limit_wait(self) -> float:
+        return self.RATE_LIMIT_WAIT_TOKENS * self._rate_limiter.refill_interval
+
+    def _ttl(self, entry: _CacheEntry) -> float:
+        return self.CACHE_TTL if entry.results else self.NEGATIVE_TTL
+
+    def _cache_get(self, key: bytes) -> Optional[list]:
+        """Return fresh cached results for key, dropping it if expired."""
+        with self._cache_lock:
+            cached = self._cache.get(key)
+            if not cached:
+                return None
+            if (time.monotonic() - cached.timestamp) >= self._ttl(cached):
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return cached.results
+
+    def _cache_put(self, key: bytes, results: list) -> None:
+        now = time.monotonic()
+        with self._cache_lock:
+            self._cache[key] = _CacheEntry(results=results, timestamp=now)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.CACHE_MAX:
+                self._cache.popitem(last=False)
+
+            # Expired entries for keys that are never asked for again would
+            # otherwise sit in the cache until LRU pressure pushes them out.
+            self._cache_writes += 1
+            if self._cache_writes % self.CACHE_SWEEP_EVERY == 0:
+                for k in [k for k, v in self._cache.items()
+                          if now - v.timestamp >= self._ttl(v)]:
+                    del self._cache[k]
+
     def search_images(self, query: str, count: int = 5,
                       orientation: str = "landscape") -> list[ImageResult]:
-        """Search Openverse for images."""
-        cache_key = f"img:{query}:{count}:{orientation}"
-        cached = self._cache.get(cache_key)
-        if cached and (time.time() - cached.timestamp) < self.CACHE_TTL:
-            return cached.results[:count]
+        """Search Openverse for images.
 
-        if not self._rate_limiter.acquire():
+        The returned list may be shared with the cache; treat it as read-only.
+        """
+        cache_key = _cache_key("img", query=query, count=count,
+                               orientation=orientation)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return head(cached, count)
+
+        if not self._rate_limiter.acquire(max_wait=self._rate_limit_wait()):
             logger.warning("Openverse rate limit reached")
             return []
 
@@ -82,18 +190,17 @@ class OpenverseClient:
         if ov_orientation in ("wide", "tall", "square"):
             params["aspect_ratio"] = ov_orientation
 
-        resp = requests.get(
+        resp = self._session.get(
             f"{BASE_URL}/v1/images/",
             params=params,
             headers=self._headers(),
             timeout=15,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = from_json(resp.content)
 
-        results = []
-        for item in data.get("results", []):
-            results.append(ImageResult(
+        results = [
+            ImageResult(
                 id=item["id"],
                 source="openverse",
                 preview_url=item.get("thumbnail", ""),
@@ -103,20 +210,41 @@ class OpenverseClient:
                 height=item.get("height", 0),
                 photographer=item.get("creator", ""),
                 license=item.get("license", "CC"),
+            )
+            for item in data.get("results", ())
+        ]
+
+        self._cache_put(cache_key, results)
+        return head(results, count)
+
+    def search_images_batch(self, queries: list[str], count: int = 5,
+                            orientation: str = "landscape",
+                            max_workers: int = 8) -> list[list[ImageResult]]:
+        """Run search_images for several queries concurrently.
+
+        Results are returned in query order. Workers share this client's
+        connection pool and rate limiter.
+        """
+        if not queries:
+            return []
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as ex:
+            return list(ex.map(
+                lambda q: self.search_images(q, count, orientation), queries,
             ))
 
-        self._cache[cache_key] = _CacheEntry(results=results, timestamp=time.time())
-        return results[:count]
-
     def search_audio(self, query: str, count: int = 5,
                      duration_max: Optional[float] = None) -> list[AudioResult]:
-        """Search Openverse for audio."""
-        cache_key = f"aud:{query}:{count}:{duration_max}"
-        cached = self._cache.get(cache_key)
-        if cached and (time.time() - cached.timestamp) < self.CACHE_TTL:
-            return cached.results[:count]
+        """Search Openverse for audio.
+
+        The returned list may be shared with the cache; treat it as read-only.
+        """
+        cache_key = _cache_key("aud", query=query, count=count,
+                               duration_max=duration_max)
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return head(cached, count)
 
-        if not self._rate_limiter.acquire():
+        if not self._rate_limiter.acquire(max_wait=self._rate_limit_wait()):
             logger.warning("Openverse rate limit reached")
             return []
 
@@ -132,19 +260,17 @@ class OpenverseClient:
             else:
                 params["length"] = "medium"
 
-        resp = requests.get(
+        resp = self._session.get(
             f"{BASE_URL}/v1/audio/",
             params=params,
             headers=self._headers(),
             timeout=15,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = from_json(resp.content)
 
-        results = []
-        for item in data.get("results", []):
-            tags = [t.get("name", "") for t in item.get("tags", []) if t.get("name")]
-            results.append(AudioResult(
+        results = [
+            AudioResult(
                 id=item["id"],
                 source=item.get("source", "openverse"),
                 title=item.get("title", ""),
@@ -154,11 +280,13 @@ class OpenverseClient:
                 creator=item.get("creator", ""),
                 license=item.get("license", ""),
                 license_url=item.get("license_url", ""),
-                tags=tags,
-            ))
+                tags=[t["name"] for t in item.get("tags", ()) if t.get("name")],
+            )
+            for item in data.get("results", ())
+        ]
 
-        self._cache[cache_key] = _CacheEntry(results=results, timestamp=time.time())
-        return results[:count]
+        self._cache_put(cache_key, results)
+        return head(results, count)
 
     def download(self, url: str, dest_dir: Path,
                  filename: Optional[str] = None) -> Path:
@@ -166,29 +294,105 @@ class OpenverseClient:
         dest_dir.mkdir(parents=True, exist_ok=True)
 
         if not filename:
-            ext = ".jpg"
-            url_lower = url.lower()
-            for candidate in [".png", ".webp", ".mp3", ".wav", ".ogg", ".flac"]:
-                if candidate in url_lower:
-                    ext = candidate
-                    break
-            filename = f"{uuid.uuid4().hex[:12]}{ext}"
+            ext = os.path.splitext(urlsplit(url).path)[1].lower()
+            if ext not in _MEDIA_EXTENSIONS:
+                ext = ".jpg"
+            filename = f"{secrets.token_hex(6)}{ext}"
 
         dest_path = dest_dir / filename
-        response = requests.get(url, timeout=30, stream=True)
+        response = self._session.get(url, headers=DOWNLOAD_HEADERS,
+                                     timeout=30, stream=True)
         response.raise_for_status()
 
-        with open(dest_path, "wb") as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                f.write(chunk)
+        size = int(response.headers.get("Content-Length") or 0)
+        identity = "Content-Encoding" not in response.headers
+        if (size >= self.RANGED_DOWNLOAD_MIN
+                and response.headers.get("Accept-Ranges") == "bytes"
+                and identity
+                and hasattr(os, "pwrite")):
+            try:
+                self._download_ranged(url, response, dest_path, size)
+            except _RangeIgnored:
+                logger.info(f"Range requests ignored for {url}; "
+                            "downloading as a single stream")
+                response = self._session.get(url, headers=DOWNLOAD_HEADERS,
+                                             timeout=30, stream=True)
+                response.raise_for_status()
+                self._download_stream(response, dest_path)
+        else:
+            self._download_stream(response, dest_path)
 
         logger.info(f"Downloaded to {dest_path}")
         return dest_path
 
+    @staticmethod
+    def _download_stream(response, dest_path: Path) -> None:
+        """Copy a whole response body to dest_path, removing it on failure."""
+        size = int(response.headers.get("Content-Length") or 0)
+        identity = "Content-Encoding" not in response.headers
+        response.raw.decode_content = True
+        try:
+            with open(dest_path, "wb") as f:
+                if identity and size:
+                    _preallocate(f.fileno(), size)
+                shutil.copyfileobj(response.raw, f, length=DOWNLOAD_CHUNK_SIZE)
+                # Drop any reserved tail if the body came up short
+                f.truncate()
+        except BaseException:
+            # A preallocated file would keep its full length otherwise
+            dest_path.unlink(missing_ok=True)
+            raise
+
+    def _download_ranged(self, url: str, response, dest_path: Path,
+                         size: int) -> None:
+        """Fetch a large file as parallel byte ranges written in place.
+
+        The already-open response supplies the first part; the remaining
+        parts are requested with Range headers on pooled connections. On any
+        failure dest_path is removed, since its preallocated length would
+        otherwise pass for a complete download. Raises _RangeIgnored if the
+        server answers a part with anything but 206.
+        """
+        part = -(-size // self.RANGED_DOWNLOAD_PARTS)
+        fd = os.open(dest_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            try:
+                if not _preallocate(fd, size):
+                    os.ftruncate(fd, size)
+
+                def fetch(start: int) -> None:
+                    end = min(start + part, size) - 1
+                    with self._session.get(
+                        url,
+                        headers={**DOWNLOAD_HEADERS, "Range": f"bytes={start}-{end}"},
+                        timeout=30, stream=True,
+                    ) as resp:
+                        resp.raise_for_status()
+                        if resp.status_code != 206:
+                            raise _RangeIgnored(url)
+                        _pwrite_stream(resp.raw, fd, start, end - start + 1)
+
+                starts = range(part, size, part)
+                with ThreadPoolExecutor(max_workers=len(starts)) as ex:
+                    pending = [ex.submit(fetch, start) for start in starts]
+                    with response:
+                        _pwrite_stream(response.raw, fd, 0, part)
+                    for future in pending:
+                        future.result()
+            finally:
+                os.close(fd)
+        except BaseException:
+            dest_path.unlink(missing_ok=True)
+            raise
+
+    def close(self) -> None:
+        """Release pooled connections."""
+        self._session.close()
+
     def get_status(self) -> dict:
         """Report auth state and rate limit info."""
         return {
             "source": "openverse",
             "authenticated": bool(self._token),
-            "remaining_requests": self._rate_limiter.tokens,
+            "remaining_requests": max(0, self._rate_limiter.tokens),
         }
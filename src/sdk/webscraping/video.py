@@ -1,23 +1,29 @@
 """Video scraping via yt-dlp (experimental, behind optional dependency)."""
 
 import logging
-import time
 from pathlib import Path
 from typing import Optional
 
+from .images import RateLimiter
+
 logger = logging.getLogger("VideoDraftMCP.webscraping.video")
 
 # Rate limit: max 3 downloads per hour
-_download_timestamps: list[float] = []
 MAX_DOWNLOADS_PER_HOUR = 3
+_rate_limiter = RateLimiter(MAX_DOWNLOADS_PER_HOUR, 3600)
+
+# Substrings of a lowercased license string that mark it as Creative Commons
+_CC_LICENSE_TOKENS = ("creative commons", "cc")
 
 
-def _check_rate_limit() -> bool:
-    """Check if we're within the download rate limit."""
-    now = time.time()
-    cutoff = now - 3600
-    _download_timestamps[:] = [t for t in _download_timestamps if t > cutoff]
-    return len(_download_timestamps) < MAX_DOWNLOADS_PER_HOUR
+def _cc_match_filter(info: dict, *, incomplete: bool = False) -> Optional[str]:
+    """yt-dlp match_filter: None admits the video, a string rejects it."""
+    if incomplete and info.get('license') is None:
+        return None  # license not extracted yet; decide on the full entry
+    license_str = (info.get('license') or '').lower()
+    if any(t in license_str for t in _CC_LICENSE_TOKENS):
+        return None
+    return "license is not Creative Commons"
 
 
 def download_video(url: str, dest_dir: Path, max_resolution: int = 720,
@@ -33,37 +39,44 @@ def download_video(url: str, dest_dir: Path, max_resolution: int = 720,
             "yt-dlp is not installed. Install with: pip install video-draft-mcp[video]"
         )
 
-    if not _check_rate_limit():
+    if not _rate_limiter.acquire():
         raise RuntimeError("Rate limit exceeded: max 3 video downloads per hour")
 
-    dest_dir.mkdir(parents=True, exist_ok=True)
-
-    ydl_opts = {
-        'format': f'bestvideo[height<={max_resolution}]+bestaudio/best[height<={max_resolution}]',
-        'outtmpl': str(dest_dir / '%(title)s.%(ext)s'),
-        'restrictfilenames': True,
-        'noplaylist': True,
-        'quiet': True,
-    }
-
-    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-        info = ydl.extract_info(url, download=False)
-
-        # Check Creative Commons license if required
+    # Only downloads that produce a file count against the hourly limit
+    try:
+        dest_dir.mkdir(parents=True, exist_ok=True)
+
+        ydl_opts = {
+            'format': f'bestvideo[height<={max_resolution}]+bestaudio/best[height<={max_resolution}]',
+            'outtmpl': str(dest_dir / '%(title)s.%(ext)s'),
+            'restrictfilenames': True,
+            'noplaylist': True,
+            'quiet': True,
+        }
+
+        # Let yt-dlp skip non-CC videos itself, so metadata is resolved once
+        # by a single extract_info(download=True) call.
         if cc_only:
-            license_str = (info.get('license') or '').lower()
-            if 'creative commons' not in license_str and 'cc' not in license_str:
-                raise ValueError(
-                    f"Video license '{info.get('license', 'unknown')}' "
-                    "is not Creative Commons. Set cc_only=False to override."
-                )
-
-        ydl.download([url])
-
-    _download_timestamps.append(time.time())
-
-    # Find the downloaded file
-    filename = ydl.prepare_filename(info)
-    result_path = Path(filename)
-    logger.info(f"Downloaded video to {result_path}")
-    return result_path
+            ydl_opts['match_filter'] = _cc_match_filter
+
+        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+            info = ydl.extract_info(url, download=True)
+
+        # A filtered video is skipped silently, so check the full metadata
+        # again to report why nothing was downloaded.
+        if cc_only and _cc_match_filter(info):
+            raise ValueError(
+                f"Video license '{info.get('license', 'unknown')}' "
+                "is not Creative Commons. Set cc_only=False to override."
+            )
+
+        # Find the downloaded file
+        downloads = info.get('requested_downloads') or [{}]
+        if not downloads[0].get('filepath'):
+            raise RuntimeError(f"yt-dlp did not report a downloaded file for {url}")
+        result_path = Path(downloads[0]['filepath'])
+        logger.info(f"Downloaded video to {result_path}")
+        return result_path
+    except BaseException:
+        _rate_limiter.release()
+        raise